@@ -0,0 +1,112 @@
+"""Benchmark the single-pass paragraph extraction against the previous per-<p> find_parent extractors.
+
+    python -m benchmarks.bench_extractors                       # synthetic pages
+    python -m benchmarks.bench_extractors --pages recorded/     # recorded pages named <source>-*.html
+
+Recorded pages are matched to an extractor by file name prefix (beInCrypto, watcherGuru, coinGape).
+Every page is parsed once; only extraction is timed. Outputs of both versions must be identical.
+"""
+import argparse
+import re
+import time
+from pathlib import Path
+from bs4 import BeautifulSoup
+from routers.beInCrypto import extract_bein_crypto_details
+from routers.coinGape import extract_coin_gape_details, clean_content
+from routers.watcherGuru import extract_watcher_guru_details
+
+BEIN_FOOTER = "px-6 pt-10 pb-10 mt-10 lg:mt-12 rounded-2xl lg:pt-11 lg:pb-15 lg:px-12 bg-grey-100 [.dark_&]:bg-dark-grey-500"
+
+# Previous implementations, kept verbatim as the reference
+
+def legacy_bein_crypto_content(page_soup):
+    paragraphs = page_soup.find_all('p')
+    content = ""
+    for paragraph in paragraphs:
+        parent_div = paragraph.find_parent('div', class_="p-5 mt-6 rounded-lg border border-grey-200")
+        contains_strong = paragraph.find('strong') is not None
+        inside_want_to_know_more_block = paragraph.find_parent('div', class_="want-to-know-more-block__inner") is not None
+        inside_footer = paragraph.find_parent('footer', class_=BEIN_FOOTER) is not None
+        if parent_div is None and not contains_strong and not inside_want_to_know_more_block and not inside_footer:
+            content += paragraph.get_text(strip=True) + "\n"
+    return content
+
+def legacy_watcher_guru_content(page_soup):
+    content_div = page_soup.find_all('p')
+    return " ".join([paragraph.text.strip() for paragraph in content_div
+                     if not paragraph.find('strong')
+                     and not paragraph.find_parent("div", class_="widget block-24 widget_block widget_text")
+                     and not paragraph.find_parent("div", class_="wp-block-embed__wrapper")])
+
+def legacy_coin_gape_content(page_soup):
+    paragraphs = page_soup.find_all('p')
+    filtered_paragraphs = [p for p in paragraphs if not p.find_parent('div', class_='footer-tags-container')]
+    return clean_content(' '.join([p.get_text(strip=True) for p in filtered_paragraphs]))
+
+EXTRACTORS = {
+    "beInCrypto": (legacy_bein_crypto_content, lambda soup: extract_bein_crypto_details(soup)[2]),
+    "watcherGuru": (legacy_watcher_guru_content, lambda soup: extract_watcher_guru_details(soup)[2]),
+    "coinGape": (legacy_coin_gape_content, lambda soup: extract_coin_gape_details(soup)[2]),
+}
+
+EXCLUDED_BLOCKS = {
+    "beInCrypto": ['<div class="p-5 mt-6 rounded-lg border border-grey-200">', '<div class="want-to-know-more-block__inner">', f'<footer class="{BEIN_FOOTER}">'],
+    "watcherGuru": ['<div class="widget block-24 widget_block widget_text">', '<div class="wp-block-embed__wrapper">'],
+    "coinGape": ['<div class="footer-tags-container">'],
+}
+
+def synthetic_page(source, paragraphs=400, depth=25):
+    """A page with deeply nested article markup, excluded blocks and <strong> paragraphs."""
+    body = []
+    for index in range(paragraphs):
+        text = f"Paragraph {index} about <a href='#'>bitcoin</a> and   markets. <!-- note -->"
+        if index % 10 == 0:
+            text = f"<strong>Read more</strong> {text}"
+        body.append(f"<p>{text}</p>")
+        if index % 25 == 0:
+            opening = EXCLUDED_BLOCKS[source][index // 25 % len(EXCLUDED_BLOCKS[source])]
+            closing = "</footer>" if opening.startswith("<footer") else "</div>"
+            body.append(f"{opening}<div><p>Excluded {index}</p></div>{closing}")
+    nested_open = "".join(f'<div class="level-{level}">' for level in range(depth))
+    nested_close = "</div>" * depth
+    return f"<html><body>{nested_open}{''.join(body)}{nested_close}</body></html>"
+
+def load_pages(pages_dir):
+    if pages_dir is None:
+        return [(source, f"synthetic-{source}", synthetic_page(source)) for source in EXTRACTORS]
+    pages = []
+    for path in sorted(Path(pages_dir).glob("*.html")):
+        source = re.split(r"[-_.]", path.name, maxsplit=1)[0]
+        if source in EXTRACTORS:
+            pages.append((source, path.name, path.read_text(errors="replace")))
+    return pages
+
+def best_time(function, soup, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(soup)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", help="Directory of recorded pages named <source>-*.html")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per extractor; the best time is reported")
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages)
+    if not pages:
+        parser.error("No recorded pages matched a benchmarked source")
+
+    print(f"{'page':40} {'legacy ms':>10} {'single-pass ms':>15} {'speedup':>8}  same output")
+    for source, name, html in pages:
+        soup = BeautifulSoup(html, 'html.parser')
+        legacy, single_pass = EXTRACTORS[source]
+        same = legacy(soup) == single_pass(soup)
+        legacy_time = best_time(legacy, soup, args.repeat)
+        single_pass_time = best_time(single_pass, soup, args.repeat)
+        print(f"{name[:40]:40} {legacy_time * 1000:10.2f} {single_pass_time * 1000:15.2f} {legacy_time / single_pass_time:7.1f}x  {same}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""Load test the API against a local stub of the news sites.
+
+    python -m benchmarks.loadtest                                   # /runAllEndpoints at 0.5, 1, 2, 4 req/s
+    python -m benchmarks.loadtest --paths /forbesScrapped,/coinDeskScrapped --rates 5,10,20,40 --duration 20
+    python -m benchmarks.loadtest --workers 4 --json results.json
+
+The stub answers every sitemap, feed, listing and article request the sources make, with a configurable
+delay, so runs are reproducible and never touch the real sites. The app runs in a uvicorn subprocess
+with UPSTREAM_BASE_URL pointing at the stub and a throwaway DATA_DIR.
+
+Requests are sent open-loop: at a fixed rate, whether or not earlier ones finished, as real pollers
+do. Meanwhile the health route is probed ten times a second; its latency is the time the app's
+event loop takes to get to a trivial request, i.e. event-loop lag plus a small constant. Throughput
+is the completion rate inside the send window, between its first and last completion, so long
+requests still draining after the window do not look like a capacity limit; the drain time is
+reported separately. A step is saturated when throughput falls below 90% of the offered rate, more
+than 1% of requests fail, or the p95 latency exceeds --slo.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+import aiohttp
+from aiohttp import web
+
+# ---------------------------------------------------------------- stub news sites
+
+# One article page carrying the markup every source's extractor looks for
+ARTICLE_TEMPLATE = """<html><head><title>{title}</title></head><body>
+<div class="breadcrumb breadcrumbPag mt-lg-0 mt-3"><span class="breadcrumb_last">{title}</span></div>
+<h1 class="typography__StyledTypography-sc-owin6q-0 kbFhjp">{title}</h1>
+<h1 class="font-heading font-semibold text-default text-[24px] leading-[32px] md:text-[40px] md:leading-[48px] mb-1">{title}</h1>
+<h1 class="self-stretch flex-grow-0 flex-shrink-0 text-xl md:text-3xl lg:text-4xl xl:text-5xl font-headline text-left text-dark">{title}</h1>
+<div class="page-title"><h1>{title}</h1></div>
+<h1 class="post-title entry-title">{title}</h1>
+<h1 class="post__title">{title}</h1>
+<h1 class="cs-entry__title">{title}</h1>
+<h1 class="h4 lg:h1 mt-3 mb-2 lg:mb-3 w-full">{title}</h1>
+<a class="contrib-link--name remove-underline author-name--tracking not-premium-contrib-link--name">Stub Author</a>
+<div class="at-authors"><a>Stub Author</a></div>
+<a class="hover:text-primary-hover font-medium underline">Stub Author</a>
+<div class="flex flex-wrap gap-1 uppercase"><a>Stub Author</a></div>
+<span class="entry-user"><a class="fn">Stub Author</a></span>
+<div class="single-author-box-name"><span class="author-name">Stub Author</span></div>
+<a class="post-card-inline__link">Stub Author</a>
+<div class="cs-entry__author-meta">Stub Author</div>
+<span class="text-blue-700 no-underline text-3">Stub Author</span>
+<span class="auth-name">Stub Author</span>
+<div class="single-post-image"><img src="https://example.com/image.jpg"></div>
+<div class="article-body fs-article fs-responsive-text current-article">{paragraphs}</div>
+<section class="at-body">{paragraphs}</section>
+<div class="p-2 basis-4/4 xl:basis-3/4"><section class="w-full">{paragraphs}</section></div>
+<div class="coincodex-content">{paragraphs}</div>
+<div class="single-post-main-middle">{paragraphs}</div>
+<div class="post-content">{paragraphs}</div>
+<div class="prose font-heading marker:text-default prose-p:mb-4 prose-p:mt-0 prose-p:text-[#333] prose-p:text-base prose-a:text-[#0000FF] prose-ul:mb-2 prose-ul:mt-0 prose-li:m-0 prose-li:text-default prose-h2:text-[24px] prose-h2:font-bold prose-h2:leading-8 prose-h2:mt-6 prose-h2:mb-4 prose-h3:text-[20px] prose-h3:font-bold prose-h3:leading-8 prose-h4:text-[20px] prose-h4:font-bold prose-h4:leading-6 mt-7 mb-6">{paragraphs}</div>
+<div class="footer-tags-container"><p>Tags</p></div>
+</body></html>"""
+
+def _stub_sitemap_index(host, path):
+    directory = path.rsplit("/", 1)[0]
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><sitemapindex>'
+        f"<sitemap><loc>https://{host}{directory}/post-sitemap1.xml</loc><lastmod>{datetime.now().isoformat()}</lastmod></sitemap>"
+        "</sitemapindex>"
+    )
+
+def _stub_sitemap(host, articles):
+    now = datetime.now().isoformat(timespec="seconds")
+    entries = "".join(
+        f"<url><loc>https://{host}/news/stub-article-{index}</loc><lastmod>{now}</lastmod>"
+        f"<news:news><news:publication><news:language>en</news:language></news:publication>"
+        f"<news:publication_date>{now}</news:publication_date><news:title>Stub article {index}</news:title></news:news></url>"
+        for index in range(articles)
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><urlset>{entries}</urlset>'
+
+def _stub_feed(host, articles, paragraphs):
+    # Even items carry the full article, odd ones only an excerpt, so both feed paths get exercised
+    now = datetime.now().astimezone().strftime("%a, %d %b %Y %H:%M:%S %z")
+    text = "".join(f"<p>Paragraph {index} of a stub article about bitcoin, ether and the markets.</p>" for index in range(paragraphs))
+    items = "".join(
+        f"<item><title>Stub article {index}</title><link>https://{host}/news/stub-article-{index}</link>"
+        f"<pubDate>{now}</pubDate><dc:creator>Stub Author</dc:creator>"
+        + (f"<content:encoded><![CDATA[{text}]]></content:encoded>" if index % 2 == 0 else "<description>Excerpt [&#8230;]</description>")
+        + "</item>"
+        for index in range(articles)
+    )
+    return ('<?xml version="1.0" encoding="UTF-8"?><rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/" '
+            f'xmlns:dc="http://purl.org/dc/elements/1.1/"><channel><title>{host}</title>{items}</channel></rss>')
+
+def _stub_listing(articles):
+    links = "".join(f'<a class="post-card-inline__title-link" href="/news/stub-article-{index}">Story</a>' for index in range(articles))
+    return f"<html><body>{links}</body></html>"
+
+def _stub_article(path, paragraphs):
+    title = f"Stub article {path.rsplit('-', 1)[-1]}"
+    text = "".join(f"<p>Paragraph {index} of a stub article about bitcoin, ether and the markets.</p>" for index in range(paragraphs))
+    return ARTICLE_TEMPLATE.format(title=title, paragraphs=text)
+
+def run_stub(port, latency, articles, paragraphs):
+    """Serve http://127.0.0.1:<port>/<host>/<path> like the news site at <host> (see utils.utils.upstream_url)."""
+    async def handle(request):
+        await asyncio.sleep(latency)
+        host, _, path = request.path.lstrip("/").partition("/")
+        path = "/" + path
+        if path.rstrip("/").endswith(("/feed", "/rss")):
+            return web.Response(text=_stub_feed(host, articles, paragraphs), content_type="application/rss+xml")
+        if path.endswith("sitemap_index.xml"):
+            return web.Response(text=_stub_sitemap_index(host, path), content_type="application/xml")
+        if "sitemap" in path or "outboundfeeds" in path:
+            return web.Response(text=_stub_sitemap(host, articles), content_type="application/xml")
+        if path.startswith("/tags/"):
+            return web.Response(text=_stub_listing(articles), content_type="text/html")
+        return web.Response(text=_stub_article(path, paragraphs), content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", handle)
+    web.run_app(app, host="127.0.0.1", port=port, print=None, access_log=None)
+
+# ---------------------------------------------------------------- app under test
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_app(port, workers, stub_url, data_dir):
+    env = dict(os.environ, UPSTREAM_BASE_URL=stub_url, DATA_DIR=data_dir, SERVING_MODE="live")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+async def wait_until_up(session, url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            async with session.get(url) as response:
+                if response.status == 200:
+                    return
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+# ---------------------------------------------------------------- load generation
+
+def percentile(values, fraction):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+async def timed_get(session, url, timeout):
+    """Return (latency, ok, perf_counter time of completion) of one GET."""
+    start = time.perf_counter()
+    try:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            await response.read()
+            ok = response.status == 200
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        ok = False
+    finished = time.perf_counter()
+    return finished - start, ok, finished
+
+async def probe_lag(session, url, stop, samples):
+    while not stop.is_set():
+        latency, ok, _ = await timed_get(session, url, 10)
+        if ok:
+            samples.append(latency)
+        await asyncio.sleep(0.1)
+
+async def run_step(session, app_url, paths, rate, duration, timeout):
+    """Offer `rate` requests per second for `duration` seconds and summarize the outcome."""
+    loop = asyncio.get_running_loop()
+    lag_samples, stop = [], asyncio.Event()
+    probe = asyncio.create_task(probe_lag(session, app_url + "/", stop, lag_samples))
+
+    tasks = []
+    start = loop.time()
+    while loop.time() - start < duration:
+        tasks.append(asyncio.create_task(timed_get(session, app_url + paths[len(tasks) % len(paths)], timeout)))
+        await asyncio.sleep(max(0.0, start + len(tasks) / rate - loop.time()))
+    send_end = time.perf_counter()
+    results = await asyncio.gather(*tasks)
+    drain = time.perf_counter() - send_end
+    stop.set()
+    await probe
+
+    latencies = [latency for latency, ok, _ in results if ok]
+    # Completion rate inside the send window, between its first and last completion; None when too few finished in it
+    in_window = [finished for _, ok, finished in results if ok and finished <= send_end]
+    measured = max(in_window) - min(in_window) if len(in_window) > 1 else 0
+    throughput = round((len(in_window) - 1) / measured, 2) if measured > 0 else None
+    return {
+        "offered_rps": rate,
+        "sent": len(results),
+        "ok": len(latencies),
+        "errors": len(results) - len(latencies),
+        "throughput_rps": throughput,
+        "drain_s": round(drain, 3),
+        "p50_s": round(percentile(latencies, 0.50), 3),
+        "p95_s": round(percentile(latencies, 0.95), 3),
+        "p99_s": round(percentile(latencies, 0.99), 3),
+        "max_s": round(max(latencies, default=float("nan")), 3),
+        "loop_lag_p50_ms": round(percentile(lag_samples, 0.50) * 1000, 1),
+        "loop_lag_p99_ms": round(percentile(lag_samples, 0.99) * 1000, 1),
+    }
+
+def saturation_reason(step, slo):
+    if step["throughput_rps"] is not None and step["throughput_rps"] < 0.9 * step["offered_rps"]:
+        return "throughput below 90% of offered rate"
+    if step["errors"] > 0.01 * step["sent"]:
+        return "more than 1% errors"
+    if step["p95_s"] > slo:
+        return f"p95 above {slo}s"
+    return None
+
+async def run_load_test(args, app_url):
+    paths = [path.strip() for path in args.paths.split(",") if path.strip()]
+    rates = [float(rate) for rate in args.rates.split(",")]
+    connector = aiohttp.TCPConnector(limit=0)  # Open-loop: never queue requests on the client side
+    steps = []
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await wait_until_up(session, app_url + "/")
+        print(f"{'rate':>6} {'sent':>5} {'ok':>5} {'err':>4} {'tput/s':>7} {'drain s':>7} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} {'lag p50 ms':>10} {'lag p99 ms':>10}")
+        for rate in rates:
+            step = await run_step(session, app_url, paths, rate, args.duration, args.timeout)
+            step["saturated"] = saturation_reason(step, args.slo)
+            steps.append(step)
+            throughput = f"{step['throughput_rps']:7.2f}" if step["throughput_rps"] is not None else f"{'-':>7}"
+            print(f"{step['offered_rps']:6g} {step['sent']:5} {step['ok']:5} {step['errors']:4} {throughput} {step['drain_s']:7.2f} "
+                  f"{step['p50_s']:7.3f} {step['p95_s']:7.3f} {step['p99_s']:7.3f} {step['loop_lag_p50_ms']:10.1f} {step['loop_lag_p99_ms']:10.1f}"
+                  + (f"  saturated: {step['saturated']}" if step["saturated"] else ""))
+            if step["saturated"] and not args.keep_going:
+                break
+    return steps
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paths", default="/runAllEndpoints", help="Comma-separated routes, requested in turn")
+    parser.add_argument("--rates", default="0.5,1,2,4", help="Comma-separated offered rates in requests per second")
+    parser.add_argument("--duration", type=float, default=15, help="Seconds per rate step")
+    parser.add_argument("--timeout", type=float, default=60, help="Per-request timeout in seconds; timeouts count as errors")
+    parser.add_argument("--slo", type=float, default=10, help="p95 latency in seconds above which a step counts as saturated")
+    parser.add_argument("--workers", type=int, default=1, help="Uvicorn workers of the app under test")
+    parser.add_argument("--app-url", help="Test an already running app instead (start it with UPSTREAM_BASE_URL set to the stub)")
+    parser.add_argument("--stub-port", type=int, default=0, help="Port of the stub sites (default: any free port)")
+    parser.add_argument("--stub-latency", type=float, default=0.05, help="Seconds the stub waits before answering")
+    parser.add_argument("--stub-articles", type=int, default=20, help="Articles per stub sitemap or listing")
+    parser.add_argument("--stub-paragraphs", type=int, default=30, help="Paragraphs per stub article")
+    parser.add_argument("--keep-going", action="store_true", help="Run all rates even after saturation")
+    parser.add_argument("--json", help="Also write the step results to this file")
+    args = parser.parse_args()
+
+    stub_port = args.stub_port or free_port()
+    stub_url = f"http://127.0.0.1:{stub_port}"
+    stub = multiprocessing.Process(target=run_stub, args=(stub_port, args.stub_latency, args.stub_articles, args.stub_paragraphs), daemon=True)
+    stub.start()
+    print(f"Stub news sites at {stub_url}")
+
+    app, data_dir = None, tempfile.TemporaryDirectory(prefix="loadtest-")
+    app_url = args.app_url
+    if not app_url:
+        app_port = free_port()
+        app = start_app(app_port, args.workers, stub_url, data_dir.name)
+        app_url = f"http://127.0.0.1:{app_port}"
+    try:
+        steps = asyncio.run(run_load_test(args, app_url.rstrip("/")))
+    finally:
+        if app:
+            app.terminate()
+            app.wait()
+        stub.terminate()
+        data_dir.cleanup()
+
+    saturated = next((step for step in steps if step["saturated"]), None)
+    if saturated:
+        sustained = [step["offered_rps"] for step in steps if not step["saturated"]]
+        print(f"Saturation at {saturated['offered_rps']:g} req/s ({saturated['saturated']}); "
+              f"highest sustained rate: {max(sustained):g} req/s" if sustained else "Saturated at the lowest rate")
+    else:
+        print("No saturation within the tested rates")
+    if args.json:
+        with open(args.json, "w") as results_file:
+            json.dump({"paths": args.paths, "workers": args.workers, "steps": steps}, results_file, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import os
+from pathlib import Path
+
+def _parse_mapping(value):
+    """Parse "key=value,key=value" settings into a dict of strings."""
+    pairs = (item.split("=", 1) for item in value.split(",") if "=" in item)
+    return {key.strip(): val.strip() for key, val in pairs}
+
+# Directory for runtime state (caches, stores, archives); created on import like the log directory
+DATA_DIR = Path(os.getenv("DATA_DIR", "data"))
+DATA_DIR.mkdir(parents=True, exist_ok=True)
+
+# How long a discovered "newest child sitemap" pointer is trusted before the index is re-read
+SITEMAP_POINTER_TTL_SECONDS = int(os.getenv("SITEMAP_POINTER_TTL_SECONDS", "3600"))
+
+# Upper bound on fetch candidates per source and run; "forbes=50,coinDesk=80" overrides it per source
+FRONTIER_MAX_PER_SOURCE = int(os.getenv("FRONTIER_MAX_PER_SOURCE", "200"))
+FRONTIER_SOURCE_CAPS = {key: int(cap) for key, cap in _parse_mapping(os.getenv("FRONTIER_SOURCE_CAPS", "")).items()}
+
+# "live" scrapes on every request; "shared" serves results from the store while one elected worker scrapes
+SERVING_MODE = os.getenv("SERVING_MODE", "live")
+SCRAPE_INTERVAL_SECONDS = int(os.getenv("SCRAPE_INTERVAL_SECONDS", "900"))
+LEADER_RETRY_SECONDS = int(os.getenv("LEADER_RETRY_SECONDS", "30"))
+SCRAPER_LOCK_PATH = Path(os.getenv("SCRAPER_LOCK_PATH", str(DATA_DIR / "scraper.lock")))
+
+# SQLite file shared by all workers, and how long an article stays in served results after it was last seen
+STORE_PATH = Path(os.getenv("STORE_PATH", str(DATA_DIR / "store.db")))
+STORE_RESULT_TTL_SECONDS = int(os.getenv("STORE_RESULT_TTL_SECONDS", str(2 * 24 * 3600)))
+
+# "inline" lets the elected scraper fetch articles itself; "queue" makes it enqueue per-URL jobs for worker.py
+CRAWL_MODE = os.getenv("CRAWL_MODE", "inline")
+JOB_QUEUE_PATH = Path(os.getenv("JOB_QUEUE_PATH", str(DATA_DIR / "jobs.db")))
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "300"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+
+# Per-deployment source selection by source key (see config/sources.py); empty ENABLED_SOURCES means all
+ENABLED_SOURCES = [key.strip() for key in os.getenv("ENABLED_SOURCES", "").split(",") if key.strip()]
+DISABLED_SOURCES = [key.strip() for key in os.getenv("DISABLED_SOURCES", "").split(",") if key.strip()]
+
+# Maximum number of articles a single source run processes at once (0 means no limit)
+PIPELINE_CONCURRENCY = int(os.getenv("PIPELINE_CONCURRENCY", "0"))
+
+# Memory budget in MB for parsed pages alive at once per process (0 means no limit); a page is weighed
+# as its HTML size times PARSED_DOCUMENT_FACTOR. MEMORY_TRACE=1 logs the peak memory of every source run.
+MEMORY_BUDGET_MB = int(os.getenv("MEMORY_BUDGET_MB", "0"))
+PARSED_DOCUMENT_FACTOR = int(os.getenv("PARSED_DOCUMENT_FACTOR", "10"))
+MEMORY_TRACE = os.getenv("MEMORY_TRACE", "0") == "1"
+
+# /stream/articles: how often subscribers re-read the store (articles stored by other processes), the
+# keep-alive comment interval and the number of articles read per store query
+STREAM_POLL_SECONDS = float(os.getenv("STREAM_POLL_SECONDS", "2"))
+STREAM_HEARTBEAT_SECONDS = float(os.getenv("STREAM_HEARTBEAT_SECONDS", "15"))
+STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "100"))
+
+# Directory for the daily article snapshots written by export.py
+EXPORT_DIR = Path(os.getenv("EXPORT_DIR", str(DATA_DIR / "exports")))
+
+# Send every news-site request to this base URL instead, as http://base/<host>/<path> (used by the load test stub)
+UPSTREAM_BASE_URL = os.getenv("UPSTREAM_BASE_URL", "").rstrip("/")
+
+# TRACING=1 records a span for every run, source, sitemap, page fetch and pipeline stage in TRACE_PATH (see traces.py)
+TRACING = os.getenv("TRACING", "0") == "1"
+TRACE_PATH = Path(os.getenv("TRACE_PATH", str(DATA_DIR / "traces.jsonl")))
+
+# Event-loop monitor behind /debug/loopLag: probe interval, and the stall after which the loop's stack is sampled
+LOOP_MONITOR = os.getenv("LOOP_MONITOR", "1") == "1"
+LOOP_LAG_INTERVAL_MS = float(os.getenv("LOOP_LAG_INTERVAL_MS", "100"))
+LOOP_BLOCK_THRESHOLD_MS = float(os.getenv("LOOP_BLOCK_THRESHOLD_MS", "100"))
+
+# ARCHIVE_RESPONSES=1 keeps every fetched sitemap and article body in ARCHIVE_DIR for offline re-extraction (reextract.py)
+ARCHIVE_RESPONSES = os.getenv("ARCHIVE_RESPONSES", "0") == "1"
+ARCHIVE_DIR = Path(os.getenv("ARCHIVE_DIR", str(DATA_DIR / "archive")))
+
+# Sources discovered through their RSS/Atom feed instead of the sitemap (keys with a feed_url, "all" for every one);
+# feed items whose content is shorter than FEED_MIN_CONTENT_CHARS or ends in "..." are fetched like sitemap entries
+FEED_SOURCES = [key.strip() for key in os.getenv("FEED_SOURCES", "").split(",") if key.strip()]
+FEED_MIN_CONTENT_CHARS = int(os.getenv("FEED_MIN_CONTENT_CHARS", "500"))
+
+# Negative cache of failing article URLs: base seconds a URL is skipped per failure reason, doubled on every
+# further failure up to NEGATIVE_CACHE_MAX_SECONDS ("http_4xx=86400,incomplete=21600" overrides single reasons)
+NEGATIVE_CACHE = os.getenv("NEGATIVE_CACHE", "1") == "1"
+NEGATIVE_CACHE_PATH = Path(os.getenv("NEGATIVE_CACHE_PATH", str(DATA_DIR / "negative_cache.db")))
+NEGATIVE_CACHE_TTLS = {"http_4xx": 86400, "http_5xx": 600, "error": 600, "incomplete": 21600}
+NEGATIVE_CACHE_TTLS.update({reason: int(ttl) for reason, ttl in _parse_mapping(os.getenv("NEGATIVE_CACHE_TTLS", "")).items()})
+NEGATIVE_CACHE_MAX_SECONDS = int(os.getenv("NEGATIVE_CACHE_MAX_SECONDS", str(7 * 24 * 3600)))
+
+# Admission control for the scrape routes in direct serving mode: concurrent requests per worker, how many more
+# may wait and for how long, and the Retry-After sent when one is turned away (ADMISSION_MAX_CONCURRENT=0 disables it)
+ADMISSION_MAX_CONCURRENT = int(os.getenv("ADMISSION_MAX_CONCURRENT", "4"))
+ADMISSION_QUEUE_SIZE = int(os.getenv("ADMISSION_QUEUE_SIZE", "8"))
+ADMISSION_QUEUE_TIMEOUT_SECONDS = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "5"))
+ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "10"))
+
+# gzip/brotli response compression (COMPRESSION=0 leaves it to a proxy); smaller whole responses are sent as they are
+COMPRESSION = os.getenv("COMPRESSION", "1") == "1"
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+# Adaptive scrape cadence for the elected scraper and scrape.py --due: a source is polled about every time it
+# publishes CADENCE_TARGET_NEW_ARTICLES, within CADENCE_MIN_SECONDS..CADENCE_MAX_SECONDS (ADAPTIVE_SCHEDULE=0: SCRAPE_INTERVAL_SECONDS)
+ADAPTIVE_SCHEDULE = os.getenv("ADAPTIVE_SCHEDULE", "1") == "1"
+CADENCE_TARGET_NEW_ARTICLES = float(os.getenv("CADENCE_TARGET_NEW_ARTICLES", "2"))
+CADENCE_MIN_SECONDS = int(os.getenv("CADENCE_MIN_SECONDS", "120"))
+CADENCE_MAX_SECONDS = int(os.getenv("CADENCE_MAX_SECONDS", "3600"))
+CADENCE_PATH = Path(os.getenv("CADENCE_PATH", str(DATA_DIR / "cadence.json")))
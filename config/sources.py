@@ -0,0 +1,17 @@
+# Manifest of all scrape sources, keyed by source key. Nothing here imports the source
+# modules; routers/registry.py loads each module the first time one of its routes runs.
+#   path:     route of the source's scrape endpoint
+#   module:   module holding the source logic
+#   endpoint: scrape coroutine inside that module (the module also defines its pipeline SourceSpec as SOURCE)
+SOURCES = {
+    "watcherGuru": {"path": "/watcherGuruScrapped", "module": "routers.watcherGuru", "endpoint": "watcher_guru_scrapped"},
+    "forbes": {"path": "/forbesScrapped", "module": "routers.forbes", "endpoint": "forbes_scrapped"},
+    "ambCrypto": {"path": "/ambcryptoScrapped", "module": "routers.ambCrypto", "endpoint": "ambcrypto_scrapped"},
+    "blockWorks": {"path": "/blockWorksScrapped", "module": "routers.blockWorks", "endpoint": "block_works_scrapped"},
+    "coinDesk": {"path": "/coinDeskScrapped", "module": "routers.coinDesk", "endpoint": "coin_desk_scrapped"},
+    "coinGape": {"path": "/coinGapeScrapped", "module": "routers.coinGape", "endpoint": "coin_gape_scrapped"},
+    "coinTelegraph": {"path": "/coinTelegraphScrapped", "module": "routers.coinTelegraph", "endpoint": "coin_telegraph_scrapped"},
+    "cryptoPotato": {"path": "/cryptoPotatoScrapped", "module": "routers.cryptoPotato", "endpoint": "crypto_potato_scrapped"},
+    "beInCrypto": {"path": "/beinCryptoScrapped", "module": "routers.beInCrypto", "endpoint": "bein_crypto_scrapped"},
+    "theDefiant": {"path": "/theDefiantScrapped", "module": "routers.theDefiant", "endpoint": "the_defiant_scrapped"},
+}
@@ -0,0 +1,48 @@
+import argparse
+from datetime import datetime, timedelta
+from pathlib import Path
+from config.loggers import logger
+from config.settings import EXPORT_DIR
+from utils.snapshot import Snapshot, write_snapshot
+from utils.store import load_articles_first_seen
+
+# Daily snapshot export of the article store for analytics.
+#
+#   python export.py                      # yesterday's articles -> data/exports/articles-<date>.snap
+#   python export.py --date 2024-05-01
+#   python export.py --show data/exports/articles-2024-05-01.snap   # list titles without inflating content
+
+def export_day(day, out_dir):
+    """Write the articles first stored on `day` (local time) to a snapshot; returns its path."""
+    start = datetime.combine(day, datetime.min.time())
+    end = start + timedelta(days=1)
+    articles = load_articles_first_seen(start.timestamp(), end.timestamp())
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    path = out_dir / f"articles-{day.isoformat()}.snap"
+    partial_path = path.with_suffix(".snap.partial")
+    write_snapshot(partial_path, articles)
+    partial_path.replace(path)  # Readers never see a half-written snapshot
+    logger.info(f"Exported {len(articles)} articles of {day} to {path}")
+    return path
+
+def show(path):
+    with Snapshot(path) as snapshot:
+        for source, title, link in zip(snapshot.column("metadata.articleSource"), snapshot.column("title"), snapshot.column("link")):
+            print(f"{source}\t{title}\t{link}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Export one day of stored articles to a snapshot file.")
+    parser.add_argument("--date", help="Day to export as YYYY-MM-DD (default: yesterday)")
+    parser.add_argument("--out", default=str(EXPORT_DIR), help="Output directory")
+    parser.add_argument("--show", metavar="FILE", help="Print source, title and link of every article in a snapshot")
+    args = parser.parse_args()
+
+    if args.show:
+        show(args.show)
+        return
+    day = datetime.strptime(args.date, "%Y-%m-%d").date() if args.date else datetime.now().date() - timedelta(days=1)
+    print(export_day(day, Path(args.out)))
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,68 @@
+import asyncio
 from fastapi import FastAPI
 from config.loggers import logger
-from routers import (
-    test, 
-    forbes, 
-    ambCrypto, 
-    blockWorks, 
-    coinDesk, 
-    coinGape, 
-    coinTelegraph, 
-    cryptoPotato, 
-    watcherGuru, 
-    beInCrypto, 
-    theDefiant,
-    all_endpoints   # Import the new router
-)
+from config.settings import SERVING_MODE, CRAWL_MODE, LOOP_MONITOR, ADMISSION_MAX_CONCURRENT, COMPRESSION
+from config.sources import SOURCES
+from utils import admission
+from utils.compression import CompressionMiddleware
+from utils.loopmon import start_monitor, stop_monitor
+from utils.serving import run_scraper_schedule, scrape_round, dispatch_round
+from routers import test, registry, all_endpoints, stream, search, debug
 
 app = FastAPI()
 
-# Include all routers
+# Include the health route, one lazily loaded route per enabled source, the fan-out route, the article stream, search and debug routes
 app.include_router(test.router)
-app.include_router(forbes.router)
-app.include_router(ambCrypto.router)
-app.include_router(watcherGuru.router)
-app.include_router(blockWorks.router)
-app.include_router(coinDesk.router)
-app.include_router(coinGape.router)
-app.include_router(coinTelegraph.router)
-app.include_router(cryptoPotato.router)
-app.include_router(beInCrypto.router)
-app.include_router(theDefiant.router)
+app.include_router(registry.source_router())
 app.include_router(all_endpoints.router)
+app.include_router(stream.router)
+app.include_router(search.router)
+app.include_router(debug.router)
+
+# Throttle the scrape routes so a burst of them cannot starve the light ones; in shared mode they only read the store
+if ADMISSION_MAX_CONCURRENT and SERVING_MODE != "shared":
+    admission.install(app, [SOURCES[key]["path"] for key in registry.enabled_sources()] + ["/runAllEndpoints"])
+
+# Compress responses for clients that accept gzip or br; added last so it wraps the rejections of admission control too
+if COMPRESSION:
+    app.add_middleware(CompressionMiddleware)
+
+scraper_schedule = None  # Background election/scrape loop in shared serving mode
 
 # Define the startup event function
 @app.on_event("startup")
 async def startup_event():
+    global scraper_schedule
     logger.info("FastAPI application started successfully")
 
+    # Measure event-loop lag continuously and sample the stack of anything blocking the loop
+    if LOOP_MONITOR:
+        start_monitor()
+
+    # In shared mode every worker competes for the scraper lock; the winner scrapes, all serve from the store
+    # With CRAWL_MODE=queue the scraper only discovers URLs and worker.py processes fetch and extraction
+    if SERVING_MODE == "shared":
+        round_function = dispatch_enabled_sources if CRAWL_MODE == "queue" else scrape_enabled_sources
+        scraper_schedule = asyncio.create_task(run_scraper_schedule(round_function, registry.enabled_sources))
+
     # If you had a database connection here, ensure it's removed
     # e.g., connect to database, initialize caches, etc.
 
+# One round of the elected scraper over the sources that are due; source modules are resolved through the registry on every round
+async def scrape_enabled_sources(keys):
+    scrapers = registry.enabled_scrapers()
+    return await scrape_round({key: scrapers[key] for key in keys if key in scrapers})
+
+async def dispatch_enabled_sources(keys):
+    specs = registry.enabled_specs()
+    return await dispatch_round({key: specs[key] for key in keys if key in specs})
+
+# Stop the scrape loop and release the scraper lock on shutdown
+@app.on_event("shutdown")
+async def shutdown_event():
+    if scraper_schedule:
+        scraper_schedule.cancel()
+    stop_monitor()
+
 # Example of logging in the main application
 logger.info("FastAPI application setup complete")
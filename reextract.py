@@ -0,0 +1,97 @@
+import argparse
+import dataclasses
+import importlib
+import json
+import sys
+import time
+from pathlib import Path
+from config.settings import ARCHIVE_DIR
+from config.sources import SOURCES
+from routers.registry import get_spec
+from utils.archive import iter_index, read_record
+from utils.frontier import Candidate
+from utils.memory import release_document
+from utils.pipeline import metadata_stage, needs_dom, parse_stage, extract_stage, build_stage
+from utils.sitemaps import parse_sitemap_date
+from utils.store import save_articles
+
+# Offline re-extraction: run the parse/extract/build stages over archived article pages (ARCHIVE_RESPONSES=1),
+# e.g. after fixing an extractor, without touching the network.
+#
+#   python reextract.py --source coinDesk --out coindesk.jsonl
+#   python reextract.py --source coinDesk --extractor my_fix:extract_coin_desk_details --day 2024-05-01
+#   python reextract.py --store          # all sources, results written to the shared store
+
+def load_extractor(path):
+    module_name, _, function_name = path.partition(":")
+    return getattr(importlib.import_module(module_name), function_name)
+
+def latest_pages(source, archive_dir, day):
+    """Index entries of a source's archived pages, keeping the newest capture of every URL."""
+    latest = {}
+    for entry in iter_index(archive_dir, kind="page", source=source, day=day):
+        current = latest.get(entry["url"])
+        if current is None or entry["fetched_at"] >= current["fetched_at"]:  # Files of several workers interleave in time
+            latest[entry["url"]] = entry
+    return list(latest.values())
+
+def reextract_source(spec, archive_dir, day):
+    articles, incomplete = [], 0
+    for entry in latest_pages(spec.key, archive_dir, day):
+        header, body = read_record(entry, archive_dir)
+        candidate = Candidate(header["url"], spec.key, parse_sitemap_date(header["published"]), header["hints"])
+        metadata = metadata_stage(spec, body, candidate)
+        fields = {**candidate.hints, **metadata}
+        if needs_dom(fields):
+            page_soup = parse_stage(spec, body)
+            try:
+                fields = extract_stage(spec, page_soup, candidate)
+            finally:
+                release_document(page_soup)
+            fields.update(metadata)
+        article = build_stage(spec, candidate, fields)
+        if article:
+            articles.append(article)
+        else:
+            incomplete += 1
+    return articles, incomplete
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-run extraction over archived responses without network access.")
+    parser.add_argument("--source", action="append", choices=list(SOURCES), help="Source key (repeatable; default: all)")
+    parser.add_argument("--extractor", help="Replacement extractor as module:function (needs exactly one --source)")
+    parser.add_argument("--day", help="Only pages archived on this day (YYYY-MM-DD)")
+    parser.add_argument("--archive-dir", default=str(ARCHIVE_DIR), help="Archive directory")
+    parser.add_argument("--out", help="Write the articles as JSON lines to this file ('-' for stdout)")
+    parser.add_argument("--store", action="store_true", help="Save the articles to the shared store")
+    args = parser.parse_args()
+
+    sources = args.source or list(SOURCES)
+    if args.extractor and len(sources) != 1:
+        parser.error("--extractor needs exactly one --source")
+
+    out = None
+    if args.out:
+        out = sys.stdout if args.out == "-" else open(args.out, "w")
+    try:
+        for key in sources:
+            spec = get_spec(key)
+            if args.extractor:
+                spec = dataclasses.replace(spec, extract=load_extractor(args.extractor))
+            start = time.perf_counter()
+            articles, incomplete = reextract_source(spec, Path(args.archive_dir), args.day)
+            elapsed = time.perf_counter() - start
+            pages = len(articles) + incomplete
+            if out:
+                for article in articles:
+                    out.write(json.dumps(article) + "\n")
+            if args.store and articles:
+                save_articles(key, articles)
+            print(f"{key}: {pages} pages, {len(articles)} complete, {incomplete} incomplete, "
+                  f"{elapsed:.2f}s ({pages / elapsed if elapsed else 0:.0f} pages/s)", file=sys.stderr)
+    finally:
+        if out and out is not sys.stdout:
+            out.close()
+
+if __name__ == "__main__":
+    main()
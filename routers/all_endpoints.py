@@ -1,49 +1,43 @@
 import asyncio
-from fastapi import APIRouter
+from typing import Optional
+from fastapi import APIRouter, Query, Request
 from config.loggers import logger
-from . import (
-    forbes, 
-    ambCrypto, 
-    blockWorks, 
-    coinDesk, 
-    coinGape, 
-    coinTelegraph, 
-    cryptoPotato, 
-    watcherGuru, 
-    beInCrypto, 
-    theDefiant
-)
+from utils.etag import conditional_response
+from utils.frontier import start_run, end_run
+from utils.projection import parse_fields
+from utils.tracing import span
+from .registry import enabled_sources, get_scraper
 
 router = APIRouter()
 
 @router.get("/runAllEndpoints")
-async def run_all_endpoints():
-    # Create a list of tasks for concurrent execution
-    tasks = [
-        watcherGuru.watcher_guru_scrapped(),
-        forbes.forbes_scrapped(),
-        ambCrypto.ambcrypto_scrapped(),
-        blockWorks.block_works_scrapped(),
-        coinDesk.coin_desk_scrapped(),
-        coinGape.coin_gape_scrapped(),
-        coinTelegraph.coin_telegraph_scrapped(),
-        cryptoPotato.crypto_potato_scrapped(),
-        beInCrypto.bein_crypto_scrapped(),
-        theDefiant.the_defiant_scrapped()
-    ]
+async def run_all_endpoints(request: Request, limit: Optional[int] = Query(None, ge=1), fields: Optional[str] = None):
+    # Create a list of tasks for concurrent execution over every enabled source; `limit` applies per source
+    sources = enabled_sources()
+    tasks = [get_scraper(key)(limit=limit) for key in sources]
 
+    # Share one frontier run so a URL listed by several sources is fetched only once
+    frontier_run = start_run()
     try:
         # Run all tasks concurrently and flatten the results
-        results = await asyncio.gather(*tasks)
+        with span("runAllEndpoints", sources=len(tasks)):
+            results = await asyncio.gather(*tasks)
         
-        # Flatten the list of lists into a single list
-        all_articles = [article for sublist in results for article in sublist]
-        
-        logger.info("All endpoints executed successfully")
+        # Flatten the article lists into a single list; a failed source returns its error dict and is left out
+        all_articles = []
+        for source, result in zip(sources, results):
+            if isinstance(result, list):
+                all_articles.extend(result)
+            else:
+                logger.error(f"Endpoint {source} failed: {result.get('error') if isinstance(result, dict) else result}")
+
+        logger.info("All endpoints executed")
 
-        # Return results in a single flattened array
-        return all_articles
+        # Return results in a single flattened array, or 304 if the client already has this set
+        return conditional_response(request, all_articles, parse_fields(fields))
 
     except Exception as e:
         logger.error(f"Error executing endpoints: {e}")
         return {"status": "Failed", "error": str(e)}
+    finally:
+        end_run(frontier_run)
\ No newline at end of file
@@ -1,83 +1,12 @@
-from fastapi import APIRouter
-import aiohttp
-from datetime import datetime
-import asyncio
-from utils.utils import fetch_sitemap, fetch_page_content, create_article, log_article_counts, headers
-from config.loggers import logger
+from utils.sitemaps import fetch_fresh_url_tags
+from utils.pipeline import SourceSpec, run_pipeline
+from utils.serving import shared_results
 
-router = APIRouter()
-
-# Define an endpoint to scrape articles from AMB Crypto's sitemap
-@router.get("/ambcryptoScrapped")
-async def ambcrypto_scrapped():
-    sitemap_url = 'https://ambcrypto.com/post-sitemap32.xml'  # Sitemap URL for AMB Crypto
-    articles = []  # List to hold the articles
-    complete_count = 0  # Counter for successfully fetched articles
-    incomplete_count = 0  # Counter for articles with missing data
-
-    try:
-        async with aiohttp.ClientSession(headers=headers) as session:
-            soup = await fetch_sitemap(session, sitemap_url)
-            if soup:
-                url_tags = soup.find_all('url')  # Extract all URL tags from the sitemap
-                today = datetime.now().strftime('%Y-%m-%d')  # Get today's date
-
-                # Create a list of tasks to fetch articles concurrently
-                tasks = [fetch_article(session, url_tag, today) for url_tag in url_tags]
-                results = await asyncio.gather(*tasks)  # Execute all tasks concurrently
-
-                # Process the results of the fetched articles
-                for result in results:
-                    if result:
-                        articles.append(result)  # Add successful articles to the list
-                        complete_count += 1  # Increment the complete count
-                    else:
-                        incomplete_count += 1  # Increment the incomplete count
-
-                total_articles = len(articles)  # Get the total number of articles fetched
-
-                # Log the counts of articles
-                log_article_counts(total_articles, complete_count, incomplete_count)
-
-                return articles  # Return the list of articles
-            else:
-                return {"error": "Failed to fetch sitemap."}
-    except Exception as e:
-        logger.error(f"Error: {e}")  # Log any errors encountered during the process
-        return {"error": str(e)}
-
-# Asynchronous function to fetch and process individual articles
-async def fetch_article(session, url_tag, today):
-    try:
-        # Extract the last modification date of the article
-        lastmod_tag = url_tag.find('lastmod')
-        lastmod_text = lastmod_tag.text
-        date_obj = datetime.strptime(lastmod_text, "%Y-%m-%dT%H:%M:%S%z")
-        formatted_date = date_obj.strftime("%B %d, %Y")
-
-        # Check if the article was modified today
-        if lastmod_tag and today in lastmod_tag.text:
-            loc_tag = url_tag.find('loc')
-            page_soup = await fetch_page_content(session, loc_tag.text)  # Fetch the page content
-            if page_soup:
-                title, author_name, content_text, img_url = extract_article_details(page_soup)  # Extract article details
-
-                # Ensure all required details are present before creating the article
-                if title and content_text and author_name:
-                    article = create_article(title, loc_tag.text, author_name, content_text, "AMB Crypto")
-                    article["metadata"]["articlePublishedOn"] = formatted_date
-                    article["imageURI"] = img_url
-
-                    return article  # Return the complete article
-                else:
-                    log_incomplete_article(loc_tag.text, title, content_text, author_name)  # Log any incomplete articles
-                    return None
-            else:
-                logger.error(f"Failed to fetch page content for URL: {loc_tag.text}")
-                return None
-    except Exception as e:
-        logger.error(f"Error fetching article: {e}")  # Log any errors encountered while fetching the article
-        return None
+# Read the newest child sitemaps of AMB Crypto's sitemap index and return their <url> entries
+async def fetch_sitemap_entries(session):
+    sitemap_index_url = 'https://ambcrypto.com/sitemap_index.xml'  # Sitemap index for AMB Crypto
+    fallback_sitemap_url = 'https://ambcrypto.com/post-sitemap32.xml'  # Used if the index cannot be read
+    return await fetch_fresh_url_tags(session, sitemap_index_url, 'post-sitemap', fallback_sitemap_url, days=1)
 
 # Function to extract article details from the page content
 def extract_article_details(page_soup):
@@ -104,13 +33,18 @@ def extract_article_details(page_soup):
 
     return title, author_name, content_text, img_url  # Return extracted details
 
-# Function to log incomplete articles with missing fields
-def log_incomplete_article(url, title, content, author_name):
-    missing_fields = []
-    if not title:
-        missing_fields.append("title")
-    if not content:
-        missing_fields.append("content")
-    if not author_name:
-        missing_fields.append("author_name")
-    logger.warning(f"Incomplete article at {url} missing fields: {', '.join(missing_fields)}")
+# Source definition; the shared pipeline handles filtering, fetching, building and logging
+SOURCE = SourceSpec(
+    key='ambCrypto',
+    name="AMB Crypto",
+    discover=fetch_sitemap_entries,
+    frontier={'date_tag': 'lastmod', 'days': 1},
+    extract=extract_article_details,
+    published_from_sitemap=True,
+    feed_url='https://ambcrypto.com/feed/',  # Used with FEED_SOURCES
+)
+
+# Define an endpoint to scrape articles from AMB Crypto's sitemap
+@shared_results('ambCrypto')
+async def ambcrypto_scrapped(limit=None):
+    return await run_pipeline(SOURCE, limit=limit)
@@ -1,74 +1,14 @@
-from fastapi import APIRouter
-import aiohttp
-from datetime import datetime, timedelta
 import re
-import asyncio
-from utils.utils import fetch_sitemap, fetch_page_content, create_article, log_article_counts, headers
-from config.loggers import logger  
+from utils.utils import fetch_sitemap
+from utils.extract import extract_paragraphs
+from utils.pipeline import SourceSpec, run_pipeline
+from utils.serving import shared_results
 
-router = APIRouter()
-
-# Define an endpoint to scrape articles from CoinGape's sitemap
-@router.get("/coinGapeScrapped")
-async def coin_gape_scrapped():
+# Read CoinGape's sitemap and return its <url> entries
+async def fetch_sitemap_entries(session):
     sitemap_url = 'https://coingape.com/news-sitemap.xml'  # Sitemap URL for CoinGape
-    articles = []  # List to hold the articles
-    complete_count = 0  # Counter for successfully fetched articles
-    incomplete_count = 0  # Counter for articles with missing data
-
-    try:
-        async with aiohttp.ClientSession(headers=headers) as session:
-            soup = await fetch_sitemap(session, sitemap_url)
-            if soup:
-                url_tags = soup.find_all('url')  # Extract all URL tags from the sitemap
-                today = datetime.now().strftime('%Y-%m-%d')  # Get today's date
-                yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')  # Get yesterday's date
-
-                # Create a list of tasks to fetch articles concurrently
-                tasks = [fetch_and_parse_article(session, url_tag, today, yesterday) for url_tag in url_tags]
-                results = await asyncio.gather(*tasks)  # Execute all tasks concurrently
-
-                # Process the results of the fetched articles
-                for result in results:
-                    if result:
-                        articles.append(result)  # Add successful articles to the list
-                        complete_count += 1  # Increment the complete count
-                    else:
-                        incomplete_count += 1  # Increment the incomplete count
-
-                total_articles = len(articles)  # Get the total number of articles fetched
-
-                # Log the counts of articles
-                log_article_counts(total_articles, complete_count, incomplete_count)
-
-                return articles  # Return the list of articles
-            else:
-                return {"error": "Failed to fetch sitemap."}
-    except Exception as e:
-        logger.error(f"Error: {e}")  # Log any errors encountered during the process
-        return {"error": str(e)}
-
-# Asynchronous function to fetch and parse individual articles
-async def fetch_and_parse_article(session, url_tag, today, yesterday):
-    try:
-        loc_tag = url_tag.find('loc')  # Find the location tag
-        date_tag = url_tag.find('news:publication_date')  # Find the publication date tag
-        if date_tag:
-            date_only = date_tag.text.split('T')[0]
-            # Check if the article was published today or yesterday
-            if date_only == today or date_only == yesterday:
-                page_soup = await fetch_page_content(session, loc_tag.text)  # Fetch the page content
-                if page_soup:
-                    title, author_name, content = extract_coin_gape_details(page_soup)  # Extract article details
-                    # Ensure all required details are present before creating the article
-                    if title and content and author_name:
-                        return create_article(title, loc_tag.text, author_name, content, "CoinGape")
-                    else:
-                        log_incomplete_article(loc_tag.text, title, content, author_name)  # Log any incomplete articles
-                        return None
-    except Exception as e:
-        logger.error(f"Error fetching article: {e}")  # Log any errors encountered while fetching the article
-        return None
+    soup = await fetch_sitemap(session, sitemap_url)
+    return soup.find_all('url') if soup else None  # Extract all URL tags from the sitemap
 
 # Function to extract article details from the page content
 def extract_coin_gape_details(page_soup):
@@ -81,9 +21,8 @@ def extract_coin_gape_details(page_soup):
     author_name = author_span.text.strip() if author_span else None
 
     # Extract and filter content paragraphs
-    paragraphs = page_soup.find_all('p')
-    filtered_paragraphs = [p for p in paragraphs if not p.find_parent('div', class_='footer-tags-container')]
-    content = ' '.join([p.get_text(strip=True) for p in filtered_paragraphs])
+    paragraphs = extract_paragraphs(page_soup, exclude=[('div', 'footer-tags-container')])
+    content = ' '.join(paragraphs)
     content = clean_content(content)  # Clean the content from unwanted text
 
     return title, author_name, content
@@ -97,13 +36,17 @@ def clean_content(content):
     content = re.sub(r'Exclusive Contact Close', '', content, flags=re.IGNORECASE)
     return content
 
-# Function to log incomplete articles with missing fields
-def log_incomplete_article(url, title, content, author_name):
-    missing_fields = []
-    if not title:
-        missing_fields.append("title")
-    if not content:
-        missing_fields.append("content")
-    if not author_name:
-        missing_fields.append("author_name")
-    logger.warning(f"Incomplete article at {url} missing fields: {', '.join(missing_fields)}")
+# Source definition; the shared pipeline handles filtering, fetching, building and logging
+SOURCE = SourceSpec(
+    key='coinGape',
+    name="CoinGape",
+    discover=fetch_sitemap_entries,
+    frontier={'date_tag': 'news:publication_date', 'days': 2},
+    extract=extract_coin_gape_details,
+    feed_url='https://coingape.com/feed/',  # Used with FEED_SOURCES
+)
+
+# Define an endpoint to scrape articles from CoinGape's sitemap
+@shared_results('coinGape')
+async def coin_gape_scrapped(limit=None):
+    return await run_pipeline(SOURCE, limit=limit)
@@ -0,0 +1,25 @@
+import asyncio
+from fastapi import APIRouter
+from utils import admission, cadence, loopmon
+from .registry import enabled_sources
+
+router = APIRouter()
+
+@router.get("/debug/loopLag")
+async def loop_lag(top: int = 10):
+    """Event-loop lag of this worker and the stacks sampled while the loop was blocked."""
+    if loopmon.monitor is None:
+        return {"error": "Event-loop monitor is disabled (LOOP_MONITOR=0)."}
+    return loopmon.monitor.stats(top)
+
+@router.get("/debug/admission")
+async def admission_stats():
+    """Running and waiting scrape requests of this worker and how many were admitted or turned away."""
+    if admission.middleware is None:
+        return {"error": "Admission control is disabled (ADMISSION_MAX_CONCURRENT=0 or shared serving mode)."}
+    return admission.middleware.stats()
+
+@router.get("/debug/cadence")
+async def scrape_cadence():
+    """Learnt publish rate, scrape interval and time to the next scheduled scrape of every enabled source."""
+    return await asyncio.to_thread(cadence.describe, enabled_sources())
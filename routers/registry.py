@@ -0,0 +1,59 @@
+import importlib
+from typing import Optional
+from fastapi import APIRouter, Query, Request
+from config.loggers import logger
+from config.settings import ENABLED_SOURCES, DISABLED_SOURCES
+from config.sources import SOURCES
+from utils.etag import conditional_response
+from utils.projection import parse_fields
+
+_modules = {}  # Source modules imported so far, by source key
+
+for unknown_key in set(ENABLED_SOURCES + DISABLED_SOURCES) - set(SOURCES):
+    logger.warning(f"Unknown source '{unknown_key}' in source selection")
+
+def enabled_sources():
+    """Return the keys of the sources this deployment serves, in manifest order."""
+    return [
+        key for key in SOURCES
+        if (not ENABLED_SOURCES or key in ENABLED_SOURCES) and key not in DISABLED_SOURCES
+    ]
+
+def load_source(key):
+    """Import a source module on first use."""
+    module = _modules.get(key)
+    if module is None:
+        module = importlib.import_module(SOURCES[key]["module"])
+        _modules[key] = module
+        logger.info(f"Loaded source {key}")
+    return module
+
+def get_scraper(key):
+    """Return the scrape endpoint coroutine of a source."""
+    return getattr(load_source(key), SOURCES[key]["endpoint"])
+
+def get_spec(key):
+    """Return the pipeline SourceSpec of a source."""
+    return load_source(key).SOURCE
+
+def enabled_scrapers():
+    """Map every enabled source to its undecorated scraper (bypassing the shared-store read)."""
+    return {key: get_scraper(key).scrape for key in enabled_sources()}
+
+def enabled_specs():
+    """Map every enabled source to its pipeline SourceSpec."""
+    return {key: get_spec(key) for key in enabled_sources()}
+
+def source_router():
+    """Build a router with one lazily loading route per enabled source."""
+    router = APIRouter()
+    for key in enabled_sources():
+        router.add_api_route(SOURCES[key]["path"], _lazy_endpoint(key), methods=["GET"], name=SOURCES[key]["endpoint"])
+    return router
+
+def _lazy_endpoint(key):
+    async def endpoint(request: Request, limit: Optional[int] = Query(None, ge=1), fields: Optional[str] = None):
+        # With `limit`, return the newest `limit` complete articles as soon as they exist; `fields` picks the article paths returned
+        articles = await get_scraper(key)(limit=limit)
+        return conditional_response(request, articles, parse_fields(fields))  # 304 when the client's ETag still matches
+    return endpoint
@@ -0,0 +1,22 @@
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, Query
+from utils.projection import parse_fields, project
+from utils.store import search_articles
+
+router = APIRouter()
+
+@router.get("/search")
+async def search(
+    q: str = Query(..., min_length=1),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    source: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    """Full-text search over the title, author and content of every stored article, best match first.
+
+    `fields` (e.g. title,link,snippet) limits every result to those paths.
+    """
+    total, results = await asyncio.to_thread(search_articles, q, page_size, (page - 1) * page_size, source)
+    return {"query": q, "total": total, "page": page, "page_size": page_size, "results": project(results, parse_fields(fields))}
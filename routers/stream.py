@@ -0,0 +1,30 @@
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+from utils.projection import parse_fields
+from utils.store import latest_seq
+from utils.stream import article_events
+
+router = APIRouter()
+
+@router.get("/stream/articles")
+async def stream_articles(request: Request, after: Optional[int] = None, source: Optional[str] = None, fields: Optional[str] = None):
+    """Push newly discovered articles as Server-Sent Events.
+
+    Resumes after the Last-Event-ID header (sent by EventSource on reconnect) or the `after`
+    query parameter; without either only articles found from now on are sent. `fields` limits every event's article.
+    """
+    last_event_id = request.headers.get("last-event-id", "")
+    if last_event_id.isdigit():
+        cursor = int(last_event_id)
+    elif after is not None:
+        cursor = after
+    else:
+        cursor = await asyncio.to_thread(latest_seq)
+
+    return StreamingResponse(
+        article_events(request, cursor, source, parse_fields(fields)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},  # Nginx must not buffer the stream
+    )
@@ -0,0 +1,105 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+from config.loggers import logger
+from config.sources import SOURCES
+from routers.registry import enabled_sources, get_spec
+from utils.cadence import due_sources, mark_scraped, mark_failed, start_observing, stop_observing, record_observations
+from utils.frontier import start_run, end_run
+from utils.pipeline import run_pipeline, sink_stage
+from utils.projection import parse_fields, project
+
+# Batch scrape without the HTTP server, e.g. from cron next to the API. Runs the same pipeline as the
+# source routes; every article is written as a JSON line the moment it is built, and stored as usual.
+#
+#   python scrape.py                                   # all enabled sources, results in the shared store
+#   python scrape.py --source coinDesk --source forbes --out articles.jsonl
+#   python scrape.py --out - --no-store --fields title,link --limit 20 --timeout 120
+#   python scrape.py --due                             # every minute from cron: only sources whose cadence is due
+
+def output_sink(out, fields, store):
+    """Sink stage that stores the article (unless --no-store) and appends it to `out` as one JSON line."""
+    async def sink(spec, article):
+        if store:
+            await sink_stage(spec, article)
+        if out:
+            out.write(json.dumps(project(article, fields)) + "\n")
+            out.flush()  # Consumers tailing the file see every article right away
+    return sink
+
+async def scrape_source(key, semaphore, sink, limit, timeout):
+    """Run one source; returns (key, articles, error, seconds)."""
+    async with semaphore:
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(run_pipeline(get_spec(key), stages={"sink": sink}, limit=limit), timeout)
+        except asyncio.TimeoutError:
+            return key, None, f"timed out after {timeout:g}s", time.perf_counter() - start
+        except Exception as e:
+            return key, None, str(e), time.perf_counter() - start
+        if isinstance(result, dict):
+            return key, None, result.get("error", "failed"), time.perf_counter() - start
+        return key, result, None, time.perf_counter() - start
+
+async def scrape(sources, concurrency, sink, limit, timeout, observe=False):
+    semaphore = asyncio.Semaphore(concurrency)
+    frontier_run = start_run()  # Like /runAllEndpoints: a URL listed by several sources is fetched once
+    observed, observing = start_observing() if observe else (None, None)  # --due runs feed the publish rates
+    try:
+        return await asyncio.gather(*(scrape_source(key, semaphore, sink, limit, timeout) for key in sources))
+    finally:
+        if observing is not None:
+            stop_observing(observing)
+            await asyncio.to_thread(record_observations, observed)
+        end_run(frontier_run)
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape sources directly, without the HTTP server.")
+    parser.add_argument("--source", action="append", choices=list(SOURCES), help="Source key (repeatable; default: all enabled sources)")
+    parser.add_argument("--out", help="Append the articles as JSON lines to this file ('-' for stdout) as they are built")
+    parser.add_argument("--no-store", action="store_true", help="Do not save the articles to the shared store")
+    parser.add_argument("--fields", help="Only write these article fields, e.g. title,link,metadata.articleSource")
+    parser.add_argument("--concurrency", type=int, default=4, help="Sources scraped at the same time")
+    parser.add_argument("--timeout", type=float, help="Give up on a source after this many seconds")
+    parser.add_argument("--limit", type=int, help="Stop each source after this many complete articles, newest first")
+    parser.add_argument("--due", action="store_true", help="Only scrape sources whose adaptive cadence says they are due")
+    args = parser.parse_args()
+
+    if args.no_store and not args.out:
+        parser.error("--no-store needs --out")
+    if args.concurrency < 1 or (args.limit is not None and args.limit < 1):
+        parser.error("--concurrency and --limit must be at least 1")
+
+    sources = args.source or enabled_sources()
+    if args.due:
+        sources = due_sources(sources)
+        if not sources:
+            print("No source is due", file=sys.stderr)
+            return
+    out = None
+    if args.out:
+        out = sys.stdout if args.out == "-" else open(args.out, "a")
+    try:
+        sink = output_sink(out, parse_fields(args.fields), not args.no_store)
+        results = asyncio.run(scrape(sources, args.concurrency, sink, args.limit, args.timeout, observe=args.due))
+    finally:
+        if out and out is not sys.stdout:
+            out.close()
+    if args.due:
+        mark_scraped([key for key, articles, _, _ in results if articles is not None])
+        mark_failed([key for key, articles, _, _ in results if articles is None])  # Retried sooner than a full interval
+
+    failed = 0
+    for key, articles, error, elapsed in results:
+        if error:
+            failed += 1
+            logger.error(f"Scrape of {key} failed: {error}")
+            print(f"{key}: failed after {elapsed:.1f}s: {error}", file=sys.stderr)
+        else:
+            print(f"{key}: {len(articles)} articles in {elapsed:.1f}s", file=sys.stderr)
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Every data path in config.settings derives from DATA_DIR, so point it at a throwaway directory
+# before any module of the app is imported.
+os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="scraper-tests-"))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
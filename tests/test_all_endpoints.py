@@ -0,0 +1,21 @@
+import asyncio
+from starlette.requests import Request
+from routers import all_endpoints
+
+def request():
+    return Request({"type": "http", "method": "GET", "path": "/runAllEndpoints", "headers": []})
+
+def test_failed_source_does_not_hide_the_others(monkeypatch):
+    async def working(limit=None):
+        return [{"title": "Title", "link": "https://example.com/a", "content": "Body", "metadata": {"author": "Jane Doe"}}]
+
+    async def failing(limit=None):
+        return {"status": "Failed", "error": "upstream down"}
+
+    scrapers = {"coinDesk": working, "forbes": failing}
+    monkeypatch.setattr(all_endpoints, "enabled_sources", lambda: list(scrapers))
+    monkeypatch.setattr(all_endpoints, "get_scraper", scrapers.get)
+    response = asyncio.run(all_endpoints.run_all_endpoints(request(), limit=None, fields=None))
+    assert response.status_code == 200
+    assert response.headers["etag"].startswith('W/"')
+    assert b"https://example.com/a" in response.body
@@ -0,0 +1,71 @@
+import multiprocessing
+import time
+from datetime import datetime
+import pytest
+from utils import cadence
+
+@pytest.fixture(autouse=True)
+def state_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(cadence, "CADENCE_PATH", tmp_path / "cadence.json")
+    monkeypatch.setattr(cadence, "CADENCE_TARGET_NEW_ARTICLES", 2)
+    monkeypatch.setattr(cadence, "CADENCE_MIN_SECONDS", 120)
+    monkeypatch.setattr(cadence, "CADENCE_MAX_SECONDS", 3600)
+    monkeypatch.setattr(cadence, "SCRAPE_INTERVAL_SECONDS", 900)
+    return tmp_path / "cadence.json"
+
+def hours_ago(now, *hours):
+    return [datetime.fromtimestamp(now - hour * 3600) for hour in hours]
+
+def test_estimate_rate():
+    now = time.time()
+    assert cadence.estimate_rate([None], now) is None
+    assert cadence.estimate_rate(hours_ago(now, 48, 72), now) == 0.0
+    assert cadence.estimate_rate(hours_ago(now, 0.5, 1, 2, 4), now) == pytest.approx(1.0)
+    assert cadence.estimate_rate(hours_ago(now, 0.1), now) == pytest.approx(1.0)  # Spread over at least an hour
+
+def test_interval_is_clamped():
+    assert cadence.interval_for("quiet", {}) == 900
+    assert cadence.interval_for("quiet", {"quiet": {"rate_per_hour": 0.0}}) == 3600
+    assert cadence.interval_for("busy", {"busy": {"rate_per_hour": 120.0}}) == 120
+    assert cadence.interval_for("steady", {"steady": {"rate_per_hour": 4.0}}) == 1800
+
+def test_publish_times_are_only_collected_while_observing():
+    now = time.time()
+    cadence.collect_publish_times("coinDesk", hours_ago(now, 1))
+    observed, token = cadence.start_observing()
+    try:
+        cadence.collect_publish_times("coinDesk", hours_ago(now, 1) + [None])
+        cadence.collect_publish_times("coinDesk", hours_ago(now, 2))
+    finally:
+        cadence.stop_observing(token)
+    cadence.collect_publish_times("coinDesk", hours_ago(now, 3))
+    assert observed == {"coinDesk": hours_ago(now, 1, 2)}
+
+def test_rates_are_smoothed_across_rounds():
+    now = time.time()
+    cadence.record_observations({"coinDesk": hours_ago(now, 0.5, 1, 2, 4), "listing": []})
+    assert cadence.load_state() == {"coinDesk": {"rate_per_hour": pytest.approx(1.0), "observed_at": pytest.approx(now, abs=5)}}
+    cadence.record_observations({"coinDesk": hours_ago(now, 48)})
+    assert cadence.load_state()["coinDesk"]["rate_per_hour"] == pytest.approx(0.5)
+
+def test_mark_scraped_schedules_the_next_run():
+    cadence.record_observations({"coinDesk": hours_ago(time.time(), 0.5, 1, 2, 4)})
+    assert cadence.due_sources(["coinDesk", "forbes"]) == ["coinDesk", "forbes"]
+    cadence.mark_scraped(["coinDesk"])
+    assert cadence.due_sources(["coinDesk", "forbes"]) == ["forbes"]
+    assert cadence.seconds_until_due(["coinDesk"]) == pytest.approx(3600, abs=5)
+    assert cadence.describe(["coinDesk"])["coinDesk"]["interval_seconds"] == 3600
+
+def mark_many(path, source):
+    cadence.CADENCE_PATH = path
+    for _ in range(20):
+        cadence.mark_scraped([f"{source}-{_}"])
+
+def test_concurrent_processes_keep_each_others_updates(state_path):
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=mark_many, args=(state_path, source)) for source in ("a", "b", "c")]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert len(cadence.load_state()) == 60
@@ -0,0 +1,49 @@
+from starlette.requests import Request
+from utils.etag import conditional_response, etag_matches, fingerprint
+from utils.projection import parse_fields
+
+def article(article_id, title="Title", content="Body"):
+    return {
+        "articleId": article_id,
+        "title": title,
+        "link": f"https://example.com/{title}",
+        "content": content,
+        "metadata": {"articleSource": "Example", "author": "Jane Doe"},
+    }
+
+def request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+def test_fingerprint_ignores_per_scrape_fields():
+    assert fingerprint([article("1")]) == fingerprint([article("2")])
+    assert fingerprint([article("1")]) != fingerprint([article("1", content="Changed")])
+
+def test_etag_matches_weak_and_lists():
+    assert etag_matches('"abc"', 'W/"abc"')
+    assert etag_matches('W/"x", W/"abc"', 'W/"abc"')
+    assert etag_matches("*", 'W/"abc"')
+    assert not etag_matches(None, 'W/"abc"')
+    assert not etag_matches('W/"x"', 'W/"abc"')
+
+def test_unchanged_set_is_not_modified():
+    first = conditional_response(request(), [article("1")])
+    second = conditional_response(request(first.headers["etag"]), [article("1")])
+    assert second.status_code == 304
+
+def test_projection_of_unfingerprinted_fields_still_changes_etag():
+    fields = parse_fields("articleId")
+    first = conditional_response(request(), [article("1")], fields)
+    changed = conditional_response(request(first.headers["etag"]), [article("2")], fields)
+    assert changed.status_code == 200
+    assert changed.body == b'[{"articleId":"2"}]'
+
+def test_projections_have_distinct_etags():
+    articles = [article("1")]
+    by_title = conditional_response(request(), articles, parse_fields("title"))
+    by_link = conditional_response(request(), articles, parse_fields("link"))
+    full = conditional_response(request(), articles)
+    assert len({by_title.headers["etag"], by_link.headers["etag"], full.headers["etag"]}) == 3
+
+def test_error_payload_passes_through():
+    assert conditional_response(request(), {"error": "Failed to fetch sitemap."}) == {"error": "Failed to fetch sitemap."}
@@ -0,0 +1,97 @@
+import asyncio
+import pytest
+import worker
+from utils import job_queue
+from utils.frontier import Candidate
+from utils.pipeline import FetchError
+
+@pytest.fixture(autouse=True)
+def queue(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_queue, "JOB_QUEUE_PATH", tmp_path / "jobs.db")
+    monkeypatch.setattr(job_queue, "_schema_ready", False)
+    monkeypatch.setattr(job_queue, "JOB_MAX_ATTEMPTS", 2)
+
+def enqueue(url="https://example.com/a"):
+    job_queue.enqueue_candidates([Candidate(url, "coinDesk", None, {"title": "T"})])
+
+def test_lease_returns_candidate_and_hides_leased_job():
+    enqueue()
+    [(job_id, candidate)] = job_queue.lease_jobs(0, 1, 10)
+    assert candidate.url == "https://example.com/a" and candidate.hints == {"title": "T"}
+    assert job_queue.lease_jobs(0, 1, 10) == []
+    assert job_queue.queue_stats() == {"leased": 1}
+
+def test_failed_job_is_retried_until_attempts_are_used_up():
+    enqueue()
+    [(job_id, _)] = job_queue.lease_jobs(0, 1, 10)
+    job_queue.fail_job(job_id, "boom")
+    assert job_queue.queue_stats() == {"pending": 1}
+    [(job_id, _)] = job_queue.lease_jobs(0, 1, 10)
+    job_queue.fail_job(job_id, "boom")
+    assert job_queue.queue_stats() == {"failed": 1}
+
+def test_expired_lease_is_taken_over(monkeypatch):
+    monkeypatch.setattr(job_queue, "JOB_LEASE_SECONDS", -1)
+    enqueue()
+    assert len(job_queue.lease_jobs(0, 1, 10)) == 1
+    assert len(job_queue.lease_jobs(0, 1, 10)) == 1
+
+def test_done_job_is_queued_again():
+    enqueue()
+    [(job_id, _)] = job_queue.lease_jobs(0, 1, 10)
+    job_queue.complete_job(job_id)
+    enqueue()
+    assert job_queue.queue_stats() == {"pending": 1}
+
+def test_shards_split_jobs_by_host():
+    enqueue("https://a.example.com/1")
+    enqueue("https://b.example.org/1")
+    leased = job_queue.lease_jobs(0, 2, 10) + job_queue.lease_jobs(1, 2, 10)
+    assert len(leased) == 2
+
+def run_job(monkeypatch, outcome):
+    async def process_candidate(spec, session, candidate, raise_errors=False):
+        assert raise_errors
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(worker, "process_candidate", process_candidate)
+    enqueue()
+    [(job_id, candidate)] = job_queue.lease_jobs(0, 1, 10)
+    sessions = {"coinDesk": object()}  # Never used by the stubbed pipeline
+    asyncio.run(worker.process_job(sessions, job_id, candidate))
+
+def test_worker_retries_fetch_errors(monkeypatch):
+    run_job(monkeypatch, FetchError("https://example.com/a", 503))
+    assert job_queue.queue_stats() == {"pending": 1}
+
+def test_worker_completes_incomplete_articles(monkeypatch):
+    run_job(monkeypatch, None)
+    assert job_queue.queue_stats() == {"done": 1}
+
+class FakeResponse:
+    def __init__(self, status):
+        self.status = status
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+class FakeSession:
+    def __init__(self, status):
+        self.status = status
+
+    def get(self, url):
+        return FakeResponse(self.status)
+
+def test_process_candidate_raises_fetch_errors_for_workers(monkeypatch):
+    from routers.registry import get_spec
+    from utils import pipeline
+    monkeypatch.setattr(pipeline, "NEGATIVE_CACHE", False)
+    spec, candidate = get_spec("coinDesk"), Candidate("https://example.com/a", "coinDesk")
+    assert asyncio.run(pipeline.process_candidate(spec, FakeSession(503), candidate)) is None
+    with pytest.raises(FetchError):
+        asyncio.run(pipeline.process_candidate(spec, FakeSession(503), candidate, raise_errors=True))
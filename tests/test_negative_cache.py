@@ -0,0 +1,54 @@
+import sqlite3
+import pytest
+from utils import negative_cache
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(negative_cache, "NEGATIVE_CACHE_PATH", tmp_path / "negative_cache.db")
+    monkeypatch.setattr(negative_cache, "_schema_ready", False)
+    monkeypatch.setattr(negative_cache, "NEGATIVE_CACHE_TTLS", {"http_4xx": 100, "http_5xx": 10, "error": 10, "incomplete": 50})
+    monkeypatch.setattr(negative_cache, "NEGATIVE_CACHE_MAX_SECONDS", 300)
+    return tmp_path / "negative_cache.db"
+
+def ttls(path):
+    with sqlite3.connect(path) as connection:
+        return dict(connection.execute("SELECT url, retry_after - updated_at FROM failures"))
+
+def test_failure_reason_by_status():
+    assert negative_cache.failure_reason(404) == "http_4xx"
+    assert negative_cache.failure_reason(503) == "http_5xx"
+
+def test_ttl_doubles_per_failure_up_to_the_maximum(cache):
+    expected = [100, 200, 300, 300]
+    for ttl in expected:
+        negative_cache.record_failure("https://example.com/a", "coinDesk", "http_4xx")
+        assert ttls(cache)["https://example.com/a"] == pytest.approx(ttl)
+
+def test_unknown_reason_uses_error_ttl(cache):
+    negative_cache.record_failure("https://example.com/a", "coinDesk", "something_else")
+    assert ttls(cache)["https://example.com/a"] == pytest.approx(10)
+
+def test_blocked_until_retry_time(monkeypatch):
+    negative_cache.record_failure("https://example.com/a", "coinDesk", "incomplete")
+    negative_cache.record_failure("https://example.org/b", "forbes", "incomplete")
+    assert negative_cache.blocked_urls("coinDesk") == {"https://example.com/a"}
+    now = negative_cache.time.time()
+    monkeypatch.setattr(negative_cache.time, "time", lambda: now + 51)
+    assert negative_cache.blocked_urls("coinDesk") == set()
+
+def test_frontier_skips_blocked_urls_before_the_cap(monkeypatch):
+    from utils import frontier
+    monkeypatch.setattr(frontier, "FRONTIER_SOURCE_CAPS", {"coinDesk": 2})
+    links = ["https://example.com/a", "https://example.com/b", "https://example.com/c"]
+    selected = frontier.build_frontier_from_links(links, "coinDesk", blocked={"https://example.com/a"})
+    assert [candidate.url for candidate in selected] == links[1:]
+
+def test_clear_removes_rows_recorded_elsewhere(cache):
+    # Recorded by another process: no state of this one knows about the row
+    with sqlite3.connect(cache) as connection:
+        connection.executescript(negative_cache.SCHEMA)
+        connection.execute("INSERT INTO failures VALUES ('https://example.com/a', 'coinDesk', 'http_5xx', 3, 9e12, 0)")
+    negative_cache.clear_failures("https://example.com/a")
+    assert ttls(cache) == {}
+    negative_cache.record_failure("https://example.com/a", "coinDesk", "http_5xx")
+    assert ttls(cache)["https://example.com/a"] == pytest.approx(10)  # Counting starts over after recovery
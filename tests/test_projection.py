@@ -0,0 +1,30 @@
+from utils.projection import parse_fields, project, canonical_fields
+
+ARTICLE = {
+    "title": "Title",
+    "link": "https://example.com/a",
+    "content": "Long body",
+    "metadata": {"articleSource": "Example", "author": "Jane Doe"},
+}
+
+def test_parse_fields_builds_nested_tree():
+    assert parse_fields("title, metadata.articleSource") == {"title": None, "metadata": {"articleSource": None}}
+
+def test_parse_fields_whole_parent_wins_over_child():
+    assert parse_fields("metadata.author,metadata") == {"metadata": None}
+    assert parse_fields("metadata,metadata.author") == {"metadata": None}
+
+def test_parse_fields_empty_spec_means_no_projection():
+    assert parse_fields(None) is None
+    assert parse_fields(" , .") is None
+
+def test_project_keeps_only_requested_paths():
+    projected = project([ARTICLE], parse_fields("title,metadata.articleSource,missing"))
+    assert projected == [{"title": "Title", "metadata": {"articleSource": "Example"}}]
+
+def test_project_without_tree_returns_value_unchanged():
+    assert project(ARTICLE, None) is ARTICLE
+
+def test_canonical_fields_ignores_order():
+    assert canonical_fields(parse_fields("link,metadata.author,title")) == canonical_fields(parse_fields("title,link,metadata.author"))
+    assert canonical_fields(parse_fields("title")) != canonical_fields(parse_fields("link"))
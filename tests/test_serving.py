@@ -0,0 +1,40 @@
+import asyncio
+import time
+import pytest
+from utils import cadence, serving
+
+class StopSchedule(Exception):
+    pass
+
+@pytest.fixture(autouse=True)
+def elected(tmp_path, monkeypatch):
+    monkeypatch.setattr(cadence, "CADENCE_PATH", tmp_path / "cadence.json")
+    monkeypatch.setattr(cadence, "CADENCE_MIN_SECONDS", 120)
+    monkeypatch.setattr(cadence, "SCRAPE_INTERVAL_SECONDS", 900)
+    monkeypatch.setattr(serving, "ADAPTIVE_SCHEDULE", True)
+    monkeypatch.setattr(serving, "try_become_scraper", lambda: True)
+    monkeypatch.setattr(serving, "release_scraper", lambda: None)
+
+async def working():
+    return []
+
+async def failing():
+    raise RuntimeError("upstream down")
+
+def test_scrape_round_returns_the_sources_that_succeeded():
+    assert asyncio.run(serving.scrape_round({"coinDesk": working, "forbes": failing})) == ["coinDesk"]
+
+def test_failed_source_is_retried_before_a_full_interval(monkeypatch):
+    scrapers = {"coinDesk": working, "forbes": failing}
+
+    def stop(keys):
+        raise StopSchedule  # End the loop after the first round
+
+    monkeypatch.setattr(serving, "seconds_until_due", stop)
+    with pytest.raises(StopSchedule):
+        asyncio.run(serving.run_scraper_schedule(lambda keys: serving.scrape_round({key: scrapers[key] for key in keys}),
+                                                 lambda: list(scrapers)))
+    state, now = cadence.load_state(), time.time()
+    assert state["coinDesk"]["next_due"] == pytest.approx(now + 900, abs=5)
+    assert "scraped_at" not in state["forbes"]
+    assert state["forbes"]["next_due"] == pytest.approx(now + 120, abs=5)
@@ -0,0 +1,67 @@
+import asyncio
+from datetime import datetime
+import aiohttp
+import pytest
+from bs4 import BeautifulSoup
+from utils import sitemaps
+
+INDEX = """<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://example.com/post-sitemap33.xml</loc></sitemap>
+  <sitemap><loc>https://example.com/post-sitemap34.xml</loc></sitemap>
+  <sitemap><loc>https://example.com/page-sitemap.xml</loc><lastmod>2026-10-19T08:00:00+00:00</lastmod></sitemap>
+  <sitemap><loc>https://example.com/post-sitemap32.xml</loc><lastmod>2026-10-18</lastmod></sitemap>
+</sitemapindex>"""
+
+CHILD = """<urlset><url><loc>https://example.com/a</loc></url><url><loc>https://example.com/b</loc></url></urlset>"""
+
+@pytest.fixture(autouse=True)
+def pointer_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(sitemaps, "SITEMAP_POINTER_CACHE_PATH", tmp_path / "sitemap_pointers.json")
+    monkeypatch.setattr(sitemaps, "_pointer_cache", None)
+
+def fake_fetch(monkeypatch, responses):
+    """Serve each URL from `responses`: markup, None (error status) or an exception to raise."""
+    async def fetch_sitemap(session, sitemap_url):
+        response = responses[sitemap_url]
+        if isinstance(response, Exception):
+            raise response
+        return BeautifulSoup(response, "lxml") if response else None
+    monkeypatch.setattr(sitemaps, "fetch_sitemap", fetch_sitemap)
+
+def test_parse_sitemap_date():
+    assert sitemaps.parse_sitemap_date("2026-10-18") == datetime(2026, 10, 18)
+    assert sitemaps.parse_sitemap_date("2026-10-18T08:00:00Z").tzinfo is None
+    assert sitemaps.parse_sitemap_date("yesterday") is None
+    assert sitemaps.parse_sitemap_date(None) is None
+
+def test_index_children_newest_first():
+    children = sitemaps.parse_sitemap_index(BeautifulSoup(INDEX, "lxml"), "post-sitemap")
+    assert [loc.rsplit("/", 1)[1] for loc, _ in children] == ["post-sitemap32.xml", "post-sitemap34.xml", "post-sitemap33.xml"]
+
+def test_select_fresh_children():
+    children = [("new.xml", datetime(2026, 10, 19)), ("old.xml", datetime(2026, 10, 1)), ("undated.xml", None)]
+    assert sitemaps.select_fresh_children(children, datetime(2026, 10, 18)) == ["new.xml"]
+    assert sitemaps.select_fresh_children(children, datetime(2026, 10, 20)) == ["new.xml"]  # Always the newest
+    assert sitemaps.select_fresh_children([], datetime(2026, 10, 20)) == []
+
+def test_unreachable_index_falls_back_to_the_fixed_sitemap(monkeypatch):
+    fake_fetch(monkeypatch, {"https://example.com/index.xml": aiohttp.ClientConnectionError("refused"),
+                             "https://example.com/fallback.xml": CHILD})
+    url_tags = asyncio.run(sitemaps.fetch_fresh_url_tags(None, "https://example.com/index.xml", "post-sitemap",
+                                                        "https://example.com/fallback.xml"))
+    assert [tag.find("loc").text for tag in url_tags] == ["https://example.com/a", "https://example.com/b"]
+
+def test_child_timeout_drops_the_cached_pointer(monkeypatch):
+    index_url = "https://example.com/index.xml"
+    sitemaps._store_pointer(index_url, ["https://example.com/post-sitemap34.xml", "https://example.com/post-sitemap33.xml"])
+    fake_fetch(monkeypatch, {"https://example.com/post-sitemap34.xml": asyncio.TimeoutError(),
+                             "https://example.com/post-sitemap33.xml": CHILD})
+    url_tags = asyncio.run(sitemaps.fetch_fresh_url_tags(None, index_url, "post-sitemap", "https://example.com/fallback.xml"))
+    assert len(url_tags) == 2
+    assert index_url not in sitemaps._load_pointer_cache()
+
+def test_no_reachable_child_returns_none(monkeypatch):
+    fake_fetch(monkeypatch, {"https://example.com/index.xml": None,
+                             "https://example.com/fallback.xml": aiohttp.ServerDisconnectedError()})
+    assert asyncio.run(sitemaps.fetch_fresh_url_tags(None, "https://example.com/index.xml", "post-sitemap",
+                                                    "https://example.com/fallback.xml")) is None
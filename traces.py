@@ -0,0 +1,69 @@
+import argparse
+from datetime import datetime
+from config.settings import TRACE_PATH
+from utils.tracing import load_traces
+
+# Waterfall view of the spans recorded with TRACING=1.
+#
+#   python traces.py                     # list the latest traces
+#   python traces.py 3f2a                # waterfall of the trace whose id starts with 3f2a
+#   python traces.py 3f2a --min-ms 50    # hide spans shorter than 50 ms
+
+BAR_WIDTH = 50
+
+def _root(spans):
+    return next((record for record in spans if record["parent_id"] is None), min(spans, key=lambda record: record["start"]))
+
+def list_traces(traces, limit):
+    print(f"{'trace':16}  {'started':19}  {'root':24} {'ms':>10} {'spans':>6}")
+    for trace_id, spans in list(traces.items())[-limit:]:
+        root = _root(spans)
+        started = datetime.fromtimestamp(root["start"]).strftime("%Y-%m-%d %H:%M:%S")
+        print(f"{trace_id:16}  {started:19}  {root['name'][:24]:24} {root['duration_ms']:10.1f} {len(spans):6}")
+
+def show_waterfall(spans, min_ms):
+    root = _root(spans)
+    total_ms = max(root["duration_ms"], 0.001)
+    children = {}
+    for record in spans:
+        children.setdefault(record["parent_id"], []).append(record)
+
+    def walk(record, depth):
+        yield record, depth
+        for child in sorted(children.get(record["span_id"], []), key=lambda child: child["start"]):
+            yield from walk(child, depth + 1)
+
+    for record, depth in walk(root, 0):
+        if record["duration_ms"] < min_ms and record is not root:
+            continue
+        offset_ms = (record["start"] - root["start"]) * 1000
+        start_column = min(BAR_WIDTH - 1, int(offset_ms / total_ms * BAR_WIDTH))
+        width = max(1, int(record["duration_ms"] / total_ms * BAR_WIDTH))
+        bar = " " * start_column + "█" * min(width, BAR_WIDTH - start_column)
+        label = record["name"]
+        detail = record["attributes"].get("source") or record["attributes"].get("url") or ""
+        if detail:
+            label += f" {detail}"
+        if record.get("error"):
+            label += " !"
+        print(f"{bar:{BAR_WIDTH}} {record['duration_ms']:10.1f} ms  {'  ' * depth}{label}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the spans recorded with TRACING=1.")
+    parser.add_argument("trace", nargs="?", help="Trace id or id prefix to show as a waterfall")
+    parser.add_argument("--file", default=str(TRACE_PATH), help="Span file to read")
+    parser.add_argument("--limit", type=int, default=20, help="Number of traces to list")
+    parser.add_argument("--min-ms", type=float, default=0, help="Hide spans shorter than this")
+    args = parser.parse_args()
+
+    traces = load_traces(args.file)
+    if not args.trace:
+        list_traces(traces, args.limit)
+        return
+    matches = [trace_id for trace_id in traces if trace_id.startswith(args.trace)]
+    if len(matches) != 1:
+        parser.error(f"{len(matches)} traces match '{args.trace}'")
+    show_waterfall(traces[matches[0]], args.min_ms)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import asyncio
+import os
+from starlette.responses import JSONResponse
+from config.loggers import logger
+from config.settings import ADMISSION_MAX_CONCURRENT, ADMISSION_QUEUE_SIZE, ADMISSION_QUEUE_TIMEOUT_SECONDS, ADMISSION_RETRY_AFTER_SECONDS
+
+# Admission control for the heavy scrape routes. At most ADMISSION_MAX_CONCURRENT of them run at once and
+# up to ADMISSION_QUEUE_SIZE more wait for a slot; anything beyond that is turned away right away with 429,
+# and a request that waited ADMISSION_QUEUE_TIMEOUT_SECONDS without a slot gets 503. Both carry Retry-After.
+# Every other route bypasses the middleware, so the health route and the stream stay responsive.
+
+class AdmissionMiddleware:
+    """Plain ASGI middleware (no BaseHTTPMiddleware, so admitted responses pass through untouched)."""
+
+    def __init__(self, app, paths, max_concurrent=ADMISSION_MAX_CONCURRENT, queue_size=ADMISSION_QUEUE_SIZE,
+                 queue_timeout=ADMISSION_QUEUE_TIMEOUT_SECONDS, retry_after=ADMISSION_RETRY_AFTER_SECONDS):
+        self.app = app
+        self.paths = frozenset(paths)
+        self.max_concurrent = max_concurrent
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.active = 0
+        self.waiting = 0
+        self.counts = {"admitted": 0, "queued": 0, "rejected_queue_full": 0, "rejected_timeout": 0}
+        self._slots = None  # Created on first use, inside the server's event loop
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            return await self.app(scope, receive, send)
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrent)
+        if self._slots.locked():
+            if self.waiting >= self.queue_size:
+                self.counts["rejected_queue_full"] += 1
+                return await self._reject(scope, receive, send, 429, "Too many scrape requests in progress, retry later.")
+            self.counts["queued"] += 1
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.counts["rejected_timeout"] += 1
+                return await self._reject(scope, receive, send, 503, "Scrape capacity exhausted, retry later.")
+            finally:
+                self.waiting -= 1
+        else:
+            await self._slots.acquire()
+
+        self.counts["admitted"] += 1
+        self.active += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.active -= 1
+            self._slots.release()
+
+    async def _reject(self, scope, receive, send, status, message):
+        logger.warning(f"Admission: {status} for {scope['path']} ({self.active} running, {self.waiting} waiting)")
+        response = JSONResponse({"status": "Failed", "error": message}, status_code=status,
+                                headers={"Retry-After": str(self.retry_after)})
+        await response(scope, receive, send)
+
+    def stats(self):
+        return {
+            "pid": os.getpid(),
+            "max_concurrent": self.max_concurrent,
+            "queue_size": self.queue_size,
+            "active": self.active,
+            "waiting": self.waiting,
+            **self.counts,
+        }
+
+middleware = None  # The middleware instance of this process, set once Starlette builds the stack
+
+def install(app, paths):
+    """Add admission control for `paths` to the app; the instance is exposed as `middleware` for /debug/admission."""
+    def factory(app):
+        global middleware
+        middleware = AdmissionMiddleware(app, paths)
+        return middleware
+    app.add_middleware(factory)
@@ -0,0 +1,73 @@
+import asyncio
+import gzip
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from config.loggers import logger
+from config.settings import ARCHIVE_RESPONSES, ARCHIVE_DIR
+
+# Append-only archive of raw responses, WARC-style: every response is one gzip member holding a JSON
+# header line and the body, so a record can be read back from its offset alone. Each process writes
+# its own responses-<date>-<pid>.gz with a JSON-lines index next to it (same name + .idx).
+
+_lock = threading.Lock()
+
+def _paths(day):
+    name = f"responses-{day}-{os.getpid()}.gz"
+    return ARCHIVE_DIR / name, ARCHIVE_DIR / (name + ".idx")
+
+def write_record(kind, url, body, source=None, published=None, hints=None):
+    """Append one response to today's archive file of this process and index it."""
+    header = {
+        "kind": kind,  # "sitemap", "feed" or "page"
+        "url": url,
+        "source": source,
+        "fetched_at": time.time(),
+        "published": published.isoformat() if published else None,
+        "hints": hints or {},
+    }
+    member = gzip.compress((json.dumps(header) + "\n" + body).encode(), compresslevel=6)
+    archive_path, index_path = _paths(datetime.now().strftime("%Y-%m-%d"))
+    with _lock:
+        ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(archive_path, "ab") as archive_file:
+            offset = archive_file.tell()
+            archive_file.write(member)
+        with open(index_path, "a") as index_file:
+            index_entry = {key: header[key] for key in ("kind", "url", "source", "fetched_at")}
+            index_entry.update(file=archive_path.name, offset=offset, length=len(member))
+            index_file.write(json.dumps(index_entry) + "\n")
+
+async def archive_response(kind, url, body, source=None, candidate=None):
+    """Archive a fetched body when ARCHIVE_RESPONSES is on; failures are logged, never raised."""
+    if not ARCHIVE_RESPONSES:
+        return
+    try:
+        published = candidate.published if candidate else None
+        hints = candidate.hints if candidate else None
+        await asyncio.to_thread(write_record, kind, url, body, source, published, hints)
+    except Exception as e:
+        logger.error(f"Failed to archive {url}: {e}")
+
+def iter_index(archive_dir=ARCHIVE_DIR, kind=None, source=None, day=None):
+    """Yield the index entries of the archive, oldest file first, optionally filtered."""
+    pattern = f"responses-{day}-*.gz.idx" if day else "responses-*.gz.idx"
+    for index_path in sorted(archive_dir.glob(pattern)):
+        with open(index_path) as index_file:
+            for line in index_file:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if (kind and entry["kind"] != kind) or (source and entry["source"] != source):
+                    continue
+                yield entry
+
+def read_record(entry, archive_dir=ARCHIVE_DIR):
+    """Return (header, body) of the record an index entry points to."""
+    with open(archive_dir / entry["file"], "rb") as archive_file:
+        archive_file.seek(entry["offset"])
+        member = archive_file.read(entry["length"])
+    header_line, _, body = gzip.decompress(member).decode().partition("\n")
+    return json.loads(header_line), body
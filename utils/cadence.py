@@ -0,0 +1,137 @@
+import fcntl
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from config.loggers import logger
+from config.settings import (CADENCE_PATH, CADENCE_TARGET_NEW_ARTICLES, CADENCE_MIN_SECONDS, CADENCE_MAX_SECONDS,
+                             SCRAPE_INTERVAL_SECONDS)
+from utils.files import write_json_atomic
+
+# Per-source scrape cadence. During a scheduled round (the elected scraper or scrape.py --due) the frontier
+# reports the publish dates it saw (sitemap lastmod, news:publication_date, feed pubDate); they give an
+# articles-per-hour rate, smoothed across rounds. Client polls of the routes are not counted. A source
+# is then due again after the time it takes to publish CADENCE_TARGET_NEW_ARTICLES, clamped to
+# CADENCE_MIN_SECONDS..CADENCE_MAX_SECONDS. Sources without dates keep SCRAPE_INTERVAL_SECONDS.
+# State lives in CADENCE_PATH, updated under a file lock, so every process shares it; the file functions
+# block and are meant for asyncio.to_thread.
+
+RATE_WINDOW_SECONDS = 24 * 3600  # Publish dates older than this do not count towards the rate
+MIN_SPAN_SECONDS = 3600  # A short list of dates is spread over at least an hour, so one burst does not look like a torrent
+SMOOTHING = 0.5  # Weight of the newest observation in the running rate
+
+_observed = ContextVar("cadence_observed", default=None)  # {source: [publish datetimes]} of the current round
+
+def estimate_rate(published, now=None):
+    """Articles per hour from a list of publish datetimes (naive local time); None if none is dated."""
+    now = now or time.time()
+    timestamps = [moment.timestamp() for moment in published if moment]
+    if not timestamps:
+        return None
+    recent = [timestamp for timestamp in timestamps if now - RATE_WINDOW_SECONDS <= timestamp <= now + 300]  # Allow small clock skew
+    if not recent:
+        return 0.0
+    span = max(now - min(recent), MIN_SPAN_SECONDS)
+    return len(recent) / span * 3600
+
+def start_observing():
+    """Collect the publish dates frontier builds see in the current context; returns (observed, token)."""
+    observed = {}
+    return observed, _observed.set(observed)
+
+def stop_observing(token):
+    _observed.reset(token)
+
+def collect_publish_times(source, published):
+    """Keep a source's publish dates while a scheduled round is observing (no I/O, safe on the event loop)."""
+    observed = _observed.get()
+    if observed is not None:
+        observed.setdefault(source, []).extend(moment for moment in published if moment)
+
+def record_observations(observed):
+    """Fold the publish dates collected in one round into each source's running rate."""
+    now = time.time()
+    with _locked_state() as state:
+        for source, published in observed.items():
+            rate = estimate_rate(published, now)
+            if rate is None:
+                continue
+            entry = state.setdefault(source, {})
+            previous = entry.get("rate_per_hour")
+            entry["rate_per_hour"] = round(rate if previous is None else SMOOTHING * rate + (1 - SMOOTHING) * previous, 4)
+            entry["observed_at"] = now
+
+def interval_for(source, state=None):
+    """Seconds between two scrapes of a source."""
+    state = load_state() if state is None else state
+    rate = state.get(source, {}).get("rate_per_hour")
+    if rate is None:
+        return SCRAPE_INTERVAL_SECONDS
+    if rate <= 0:
+        return CADENCE_MAX_SECONDS
+    return int(min(max(CADENCE_TARGET_NEW_ARTICLES / rate * 3600, CADENCE_MIN_SECONDS), CADENCE_MAX_SECONDS))
+
+def due_sources(sources):
+    """The sources whose next scrape time has come (never scraped ones included), in the given order."""
+    state, now = load_state(), time.time()
+    return [source for source in sources if state.get(source, {}).get("next_due", 0) <= now]
+
+def mark_scraped(sources):
+    """Schedule the next scrape of sources that just ran, from their latest rate."""
+    now = time.time()
+    with _locked_state() as state:
+        for source in sources:
+            entry = state.setdefault(source, {})
+            entry["interval_seconds"] = interval_for(source, state)
+            entry["scraped_at"] = now
+            entry["next_due"] = now + entry["interval_seconds"]
+            logger.info(f"Next scrape of {source} in {entry['interval_seconds']}s "
+                        f"(rate {entry.get('rate_per_hour', 'unknown')} articles/hour)")
+
+def mark_failed(sources):
+    """Retry sources whose scrape just failed after the shortest cadence, keeping their interval."""
+    now = time.time()
+    with _locked_state() as state:
+        for source in sources:
+            entry = state.setdefault(source, {})
+            entry["next_due"] = now + CADENCE_MIN_SECONDS
+            logger.info(f"Scrape of {source} failed, retrying in {CADENCE_MIN_SECONDS}s")
+
+def seconds_until_due(sources):
+    """Seconds until the first of the sources is due (0 if one already is)."""
+    state, now = load_state(), time.time()
+    return max(0.0, min((state.get(source, {}).get("next_due", 0) - now for source in sources), default=SCRAPE_INTERVAL_SECONDS))
+
+def describe(sources):
+    """Rate, interval and time to the next scrape of every source, for /debug/cadence."""
+    state, now = load_state(), time.time()
+    return {
+        source: {
+            "rate_per_hour": state.get(source, {}).get("rate_per_hour"),
+            "interval_seconds": interval_for(source, state),
+            "due_in_seconds": round(max(0.0, state.get(source, {}).get("next_due", 0) - now)),
+        }
+        for source in sources
+    }
+
+@contextmanager
+def _locked_state():
+    # Read-modify-write under an exclusive lock, so concurrent processes never lose each other's updates
+    with open(CADENCE_PATH.with_suffix(".lock"), "a+") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)  # Released when the file is closed
+        state = load_state()
+        yield state
+        _save_state(state)
+
+def load_state():
+    # Read on every use: the file is tiny, several processes update it, and it is replaced atomically
+    try:
+        return json.loads(CADENCE_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+def _save_state(state):
+    try:
+        write_json_atomic(CADENCE_PATH, state)
+    except OSError as e:
+        logger.error(f"Failed to save scrape cadence: {e}")
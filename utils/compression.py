@@ -0,0 +1,123 @@
+import asyncio
+import zlib
+from starlette.datastructures import Headers, MutableHeaders
+from config.settings import COMPRESSION_MIN_BYTES, COMPRESSION_GZIP_LEVEL, COMPRESSION_BROTLI_QUALITY
+
+try:
+    import brotli  # Optional: `pip install brotli` adds br next to gzip
+except ImportError:
+    brotli = None
+
+# Response compression negotiated by Accept-Encoding. Whole responses below COMPRESSION_MIN_BYTES are sent
+# as they are. Streaming responses (the SSE stream) are compressed chunk by chunk with a sync flush after
+# every chunk, so each event reaches the client at once instead of waiting in the compressor.
+
+ENCODINGS = ("br", "gzip") if brotli else ("gzip",)  # Preferred first when the client rates them equally
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/xml", "application/javascript")
+THREAD_MIN_BYTES = 256 * 1024  # Bodies this large are compressed off the event loop
+
+class _GzipCompressor:
+    def __init__(self):
+        self._zlib = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)  # wbits 31: gzip container
+
+    def compress(self, data, final):
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+class _BrotliCompressor:
+    def __init__(self):
+        self._brotli = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+
+    def compress(self, data, final):
+        return self._brotli.process(data) + (self._brotli.finish() if final else self._brotli.flush())
+
+COMPRESSORS = {"gzip": _GzipCompressor, "br": _BrotliCompressor}
+
+def choose_encoding(accept_encoding):
+    """Pick the encoding with the highest q-value the client accepts, or None for identity."""
+    ratings = {}
+    for part in accept_encoding.split(","):
+        name, _, parameters = part.partition(";")
+        quality = 1.0
+        parameters = parameters.strip()
+        if parameters.startswith("q="):
+            try:
+                quality = float(parameters[2:])
+            except ValueError:
+                quality = 0.0
+        ratings[name.strip().lower()] = quality
+    rated = [(ratings.get(name, ratings.get("*", 0.0)), -rank, name) for rank, name in enumerate(ENCODINGS)]
+    quality, _, name = max(rated)
+    return name if quality > 0 else None
+
+def is_compressible(status, headers):
+    content_type = headers.get("content-type", "")
+    return (status not in (204, 304) and "content-encoding" not in headers
+            and content_type.startswith(COMPRESSIBLE_TYPES))
+
+class CompressionMiddleware:
+    """Plain ASGI middleware, so streamed bodies are compressed as they are sent rather than buffered."""
+
+    def __init__(self, app, minimum_size=COMPRESSION_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            return await self.app(scope, receive, send)
+        await _CompressingResponder(self.app, encoding, self.minimum_size)(scope, receive, send)
+
+class _CompressingResponder:
+    def __init__(self, app, encoding, minimum_size):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send = None
+        self.start_message = None  # Held back until the first body chunk shows whether to compress
+        self.compressor = None
+
+    async def __call__(self, scope, receive, send):
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message):
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body":
+            return await self.send(message)
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start_message is not None:
+            start_message, self.start_message = self.start_message, None
+            headers = MutableHeaders(raw=start_message["headers"])
+            if not is_compressible(start_message["status"], headers):
+                await self.send(start_message)
+                return await self.send(message)
+            headers.add_vary_header("Accept-Encoding")
+            if not more_body and len(body) < self.minimum_size:
+                await self.send(start_message)
+                return await self.send(message)
+
+            headers["Content-Encoding"] = self.encoding
+            self.compressor = COMPRESSORS[self.encoding]()
+            if more_body:
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+                await self.send(start_message)
+            else:
+                if len(body) >= THREAD_MIN_BYTES:
+                    body = await asyncio.to_thread(self.compressor.compress, body, True)
+                else:
+                    body = self.compressor.compress(body, True)
+                headers["Content-Length"] = str(len(body))
+                await self.send(start_message)
+                return await self.send({"type": "http.response.body", "body": body})
+        elif self.compressor is None:
+            return await self.send(message)  # Remaining chunks of an uncompressed response
+
+        chunk = self.compressor.compress(body, not more_body)
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
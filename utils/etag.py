@@ -0,0 +1,64 @@
+import hashlib
+import json
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from utils.projection import project, canonical_fields
+
+# Fields that identify what a consumer sees of an article. articleId, the extraction timestamp and
+# the scrape-day publish date change on every live scrape without the article changing.
+FINGERPRINT_FIELDS = ("link", "title", "content", "imageURI")
+
+def fingerprint(articles):
+    """Return a stable hash of an article list that ignores per-scrape fields."""
+    digest = hashlib.blake2b(digest_size=16)
+    for article in articles:
+        for name in FINGERPRINT_FIELDS:
+            digest.update(str(article.get(name, "")).encode())
+            digest.update(b"\x1f")  # Field separator, so ("ab", "c") and ("a", "bc") differ
+        digest.update(str(article.get("metadata", {}).get("author", "")).encode())
+        digest.update(b"\x1e")  # Record separator
+    return digest.hexdigest()
+
+def projection_fingerprint(projected, fields):
+    """Hash every value a ?fields= projection returns, plus the projection itself.
+
+    A projection may consist only of fields FINGERPRINT_FIELDS leaves out (e.g. articleId), so all of it counts.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(canonical_fields(fields).encode() + b"\x1d")
+    digest.update(json.dumps(projected, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+def etag_matches(if_none_match, etag):
+    """Weak comparison of an If-None-Match header against our ETag, as required for GET."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+def conditional_response(request: Request, payload, fields=None):
+    """Answer with 304 if the client already holds this article set, else with the payload and its ETag.
+
+    `fields` is a parsed ?fields= projection; its ETag covers every projected value and names the projection.
+    The ETag is weak: an unchanged set may still differ in articleId or timestamps between scrapes.
+    Error payloads (dicts) are returned as they are and never cached.
+    """
+    if not isinstance(payload, list):
+        return payload
+    if fields is None:
+        etag = f'W/"{fingerprint(payload)}"'
+    else:
+        payload = project(payload, fields)
+        etag = f'W/"{projection_fingerprint(payload, fields)}"'
+    response_headers = {"ETag": etag, "Cache-Control": "no-cache"}  # Caches must revalidate every poll
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=response_headers)
+    return JSONResponse(payload, headers=response_headers)
@@ -0,0 +1,56 @@
+from bs4.element import CData, NavigableString, Tag
+
+def extract_paragraphs(root, exclude=(), skip_containing=(), strip=True, tag='p'):
+    """Return the text of every <p> under `root` in document order, walking the tree only once.
+
+    `exclude` holds (tag name, class) pairs; matching elements are pruned together with their
+    whole subtree, which replaces a find_parent() call per paragraph. The class may be a single
+    class or the full class attribute, as with BeautifulSoup's class_ argument, or None to
+    exclude every element with that tag name. Paragraphs containing one of the tags in
+    `skip_containing` (e.g. 'strong') are dropped. With `strip`, each paragraph's text matches
+    get_text(strip=True); otherwise it matches .text.
+    """
+    exclude_by_tag = {}
+    for name, class_name in exclude:
+        exclude_by_tag.setdefault(name, []).append(class_name)
+    skip_containing = set(skip_containing)
+
+    paragraphs = []
+    stack = list(reversed(root.contents))
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, Tag):
+            continue
+        rules = exclude_by_tag.get(node.name)
+        if rules and _matches_any(node, rules):
+            continue  # Prune the excluded subtree
+        if node.name == tag:
+            text = _paragraph_text(node, skip_containing, strip)
+            if text is not None:
+                paragraphs.append(text)
+        stack.extend(reversed(node.contents))  # Keep document order; nested paragraphs are still found
+    return paragraphs
+
+def _matches_any(node, class_rules):
+    classes = node.get('class') or []
+    for class_name in class_rules:
+        if class_name is None or class_name in classes or class_name == " ".join(classes):
+            return True
+    return False
+
+def _paragraph_text(paragraph, skip_containing, strip):
+    # Same string types as Tag.get_text(), collected in the same pass that looks for skip tags
+    types = paragraph.interesting_string_types or (NavigableString, CData)
+    parts = []
+    for descendant in paragraph.descendants:
+        if isinstance(descendant, NavigableString):
+            descendant_type = type(descendant)
+            if descendant_type is types if isinstance(types, type) else descendant_type in types:
+                if strip:
+                    descendant = descendant.strip()
+                    if not descendant:
+                        continue
+                parts.append(descendant)
+        elif descendant.name in skip_containing:
+            return None
+    return "".join(parts)
@@ -0,0 +1,118 @@
+import re
+import xml.etree.ElementTree as ET
+from email.utils import parsedate_to_datetime
+from bs4 import BeautifulSoup
+from config.loggers import logger
+from config.settings import FEED_MIN_CONTENT_CHARS, ARCHIVE_RESPONSES
+from utils.archive import archive_response
+from utils.extract import extract_paragraphs
+from utils.sitemaps import parse_sitemap_date
+from utils.tracing import span
+from utils.utils import upstream_url
+
+# RSS 2.0 / Atom ingestion. The feed is parsed incrementally while it downloads, and every finished
+# <item>/<entry> is turned into a plain dict and cleared, so the whole feed never sits in memory as a tree.
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+CONTENT = "{http://purl.org/rss/1.0/modules/content/}encoded"
+DC_CREATOR = "{http://purl.org/dc/elements/1.1/}creator"
+MEDIA = "{http://search.yahoo.com/mrss/}"
+
+TRUNCATION_MARKERS = ("[…]", "[...]", "…", "...", "Read more", "Continue reading")
+FEED_FOOTER_PATTERN = re.compile(r"^The post .* appeared first on .*$")  # Added by WordPress to every item
+
+class FeedEntries(list):
+    """Entries parsed from a feed; lets the filter stage tell them apart from sitemap <url> tags."""
+
+async def fetch_feed_entries(session, feed_url):
+    """Stream-parse an RSS or Atom feed and return its entries, or None if it could not be fetched or parsed."""
+    with span("fetch_feed", url=feed_url):
+        async with session.get(upstream_url(feed_url)) as response:
+            if response.status != 200:
+                logger.error(f"Error: Received status code {response.status} when trying to fetch the feed {feed_url}.")
+                return None
+            parser = ET.XMLPullParser(events=("end",))
+            entries, raw = FeedEntries(), []
+            try:
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    if ARCHIVE_RESPONSES:
+                        raw.append(chunk)
+                    parser.feed(chunk)
+                    _collect_entries(parser, entries)
+                parser.close()
+                _collect_entries(parser, entries)
+            except ET.ParseError as e:
+                logger.error(f"Failed to parse feed {feed_url}: {e}")
+                return None
+    if raw:
+        await archive_response("feed", feed_url, b"".join(raw).decode("utf-8", "replace"))
+    logger.info(f"Feed {feed_url} listed {len(entries)} entries")
+    return entries
+
+def _collect_entries(parser, entries):
+    for _, element in parser.read_events():
+        if element.tag in ("item", f"{ATOM}entry"):
+            entry = _atom_entry(element) if element.tag.startswith(ATOM) else _rss_item(element)
+            if entry["url"]:
+                entries.append(entry)
+            element.clear()  # Drop the parsed item; only the dict is kept
+
+def _rss_item(item):
+    published = item.findtext("pubDate")
+    image = next((element for element in (item.find(f"{MEDIA}content"), item.find(f"{MEDIA}thumbnail"), item.find("enclosure"))
+                  if element is not None), None)  # Elements without children are falsy, so no `or` chain
+    return _entry(
+        url=(item.findtext("link") or "").strip(),
+        title=item.findtext("title"),
+        author=item.findtext(DC_CREATOR) or item.findtext("author"),
+        published=_parse_rfc822(published) if published else None,
+        full_content=item.findtext(CONTENT),
+        image=image.get("url") if image is not None else None,
+    )
+
+def _atom_entry(entry):
+    link = next((link.get("href") for link in entry.findall(f"{ATOM}link") if link.get("rel", "alternate") == "alternate"), "")
+    return _entry(
+        url=(link or "").strip(),
+        title=entry.findtext(f"{ATOM}title"),
+        author=entry.findtext(f"{ATOM}author/{ATOM}name"),
+        published=parse_sitemap_date(entry.findtext(f"{ATOM}published") or entry.findtext(f"{ATOM}updated")),
+        full_content=entry.findtext(f"{ATOM}content"),
+        image=None,
+    )
+
+def _entry(url, title, author, published, full_content, image):
+    # Only full content (content:encoded, atom:content) counts; description/summary are excerpts
+    content = _html_to_text(full_content) if full_content else None
+    if content and is_truncated(content):
+        content = None
+    return {
+        "url": url,
+        "published": published,
+        "title": title.strip() if title else None,
+        "author": author.strip() if author else None,
+        "content": content,
+        "imageURI": image,
+    }
+
+def is_truncated(content):
+    """Whether feed content looks like an excerpt rather than the whole article."""
+    text = content.rstrip()
+    return len(text) < FEED_MIN_CONTENT_CHARS or text.endswith(TRUNCATION_MARKERS)
+
+def _html_to_text(fragment):
+    soup = BeautifulSoup(fragment, 'html.parser')
+    paragraphs = [" ".join(paragraph.split()) for paragraph in extract_paragraphs(soup, strip=False)]
+    paragraphs = [paragraph for paragraph in paragraphs if paragraph and not FEED_FOOTER_PATTERN.match(paragraph)]
+    text = "\n".join(paragraphs) if paragraphs else soup.get_text(" ", strip=True)
+    soup.decompose()
+    return text
+
+def _parse_rfc822(text):
+    try:
+        parsed = parsedate_to_datetime(text.strip())
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)  # Naive local time like parse_sitemap_date
+    return parsed
@@ -0,0 +1,8 @@
+import json
+import os
+
+def write_json_atomic(path, data):
+    """Write `data` as JSON through a temporary file, so concurrent readers never see a partial file."""
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")  # One per process, so writers never share it
+    tmp_path.write_text(json.dumps(data))
+    os.replace(tmp_path, path)
@@ -0,0 +1,117 @@
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit
+from config.loggers import logger
+from config.settings import FRONTIER_MAX_PER_SOURCE, FRONTIER_SOURCE_CAPS
+from utils.cadence import collect_publish_times
+from utils.sitemaps import parse_sitemap_date
+
+# URLs already handed out during the current multi-source run (see start_run)
+_run_seen = ContextVar("frontier_run_seen", default=None)
+
+@dataclass
+class Candidate:
+    """A URL that passed the frontier and is worth fetching."""
+    url: str
+    source: str
+    published: Optional[datetime] = None
+    hints: dict = field(default_factory=dict)  # Extra fields read from the sitemap, e.g. news:title
+
+def start_run():
+    """Share one set of seen URLs between all sources scraped in the current context."""
+    return _run_seen.set(set())
+
+def end_run(token):
+    """Close a run opened with start_run."""
+    _run_seen.reset(token)
+
+def normalize_url(url):
+    """Normalize a URL for deduplication (lowercase host, no fragment or trailing slash)."""
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ''))
+
+def build_frontier(url_tags, source, date_tag='lastmod', days=2, languages=None, hints=None, require_hints=False, blocked=frozenset()):
+    """Filter sitemap <url> tags in bulk and return deduplicated candidates, newest first and capped.
+
+    Only entries dated within the last `days` days (today counts as one) are kept. `languages`
+    restricts news:language when the tag is present, and `hints` maps hint names to sitemap tags
+    whose text is carried along on the candidate. URLs in `blocked` (the negative cache) are skipped.
+    """
+    allowed_days = {(datetime.now() - timedelta(days=offset)).strftime('%Y-%m-%d') for offset in range(days)}
+    candidates = []
+    for url_tag in url_tags:
+        loc_tag = url_tag.find('loc')
+        date_node = url_tag.find(date_tag)
+        if not loc_tag or not date_node:
+            continue
+        date_text = date_node.text.strip()
+        if date_text[:10] not in allowed_days:  # Cheap prefix check before any date parsing
+            continue
+        if languages:
+            language_tag = url_tag.find('news:language')
+            if language_tag and language_tag.text.strip() not in languages:
+                continue
+
+        candidate_hints = {}
+        if hints:
+            for name, tag_name in hints.items():
+                hint_tag = url_tag.find(tag_name)
+                if hint_tag:
+                    candidate_hints[name] = hint_tag.text
+            if require_hints and len(candidate_hints) < len(hints):
+                continue
+
+        candidates.append(Candidate(loc_tag.text.strip(), source, parse_sitemap_date(date_text), candidate_hints))
+
+    candidates.sort(key=lambda candidate: candidate.published or datetime.min, reverse=True)
+    return _dedup_and_cap(candidates, source, len(url_tags), blocked)
+
+def build_frontier_from_feed(entries, source, days=2, blocked=frozenset()):
+    """Build candidates from parsed feed entries; their fields travel as hints, so complete entries need no fetch."""
+    allowed_days = {(datetime.now() - timedelta(days=offset)).date() for offset in range(days)}
+    candidates = []
+    for entry in entries:
+        if entry["published"] and entry["published"].date() not in allowed_days:
+            continue
+        hints = {name: entry[name] for name in ("title", "author", "content", "imageURI") if entry.get(name)}
+        candidates.append(Candidate(entry["url"], source, entry["published"], hints))
+
+    candidates.sort(key=lambda candidate: candidate.published or datetime.min, reverse=True)
+    return _dedup_and_cap(candidates, source, len(entries), blocked)
+
+def build_frontier_from_links(links, source, blocked=frozenset()):
+    """Build candidates from an ordered list of links (e.g. a listing page) that carries no dates."""
+    return _dedup_and_cap([Candidate(link, source) for link in links], source, len(links), blocked)
+
+def source_cap(source):
+    """Return the per-run candidate cap for a source (0 means unlimited)."""
+    return FRONTIER_SOURCE_CAPS.get(source, FRONTIER_MAX_PER_SOURCE)
+
+def _dedup_and_cap(candidates, source, total_entries, blocked=frozenset()):
+    collect_publish_times(source, [candidate.published for candidate in candidates])  # Before the cap hides part of the rate
+    run_seen = _run_seen.get()
+    seen = set()
+    skipped = 0
+    cap = source_cap(source)
+    selected = []
+    for candidate in candidates:
+        key = normalize_url(candidate.url)
+        if key in seen or (run_seen is not None and key in run_seen):
+            continue
+        if candidate.url in blocked:
+            skipped += 1  # Failed recently; skipped before the cap so it does not take a slot
+            continue
+        seen.add(key)
+        selected.append(candidate)
+        if cap and len(selected) >= cap:
+            break
+
+    if run_seen is not None:
+        run_seen.update(seen)
+
+    logger.info(f"Frontier for {source}: {len(selected)} of {total_entries} entries selected"
+                + (f", {skipped} skipped by the negative cache" if skipped else ""))
+    return selected
@@ -0,0 +1,128 @@
+import hashlib
+import json
+import sqlite3
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+from config.settings import JOB_QUEUE_PATH, JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS
+from utils.frontier import Candidate
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL UNIQUE,
+    source TEXT NOT NULL,
+    host_key INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    leased_until REAL NOT NULL DEFAULT 0,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, leased_until);
+"""
+
+_schema_ready = False
+
+def connect():
+    """Open a connection to the job queue, creating the schema on first use."""
+    global _schema_ready
+    connection = sqlite3.connect(JOB_QUEUE_PATH, timeout=30, isolation_level=None)
+    connection.execute("PRAGMA journal_mode=WAL")
+    if not _schema_ready:
+        connection.executescript(SCHEMA)
+        _schema_ready = True
+    return connection
+
+def host_key(url):
+    """Stable numeric key of a URL's host; jobs are sharded by host_key % shard count."""
+    host = urlsplit(url).netloc.lower().encode()
+    return int.from_bytes(hashlib.blake2b(host, digest_size=4).digest(), "big")  # crc32 spreads similar hosts poorly
+
+def enqueue_candidates(candidates):
+    """Queue one fetch/extract job per candidate; finished jobs for the same URL are queued again."""
+    now = time.time()
+    connection = connect()
+    try:
+        connection.execute("BEGIN IMMEDIATE")
+        for candidate in candidates:
+            connection.execute(
+                """
+                INSERT INTO jobs (url, source, host_key, payload, updated_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (url) DO UPDATE SET
+                    source = excluded.source, payload = excluded.payload, status = 'pending',
+                    attempts = 0, error = NULL, updated_at = excluded.updated_at
+                WHERE jobs.status IN ('done', 'failed')
+                """,
+                (candidate.url, candidate.source, host_key(candidate.url), json.dumps(_candidate_payload(candidate)), now),
+            )
+        connection.execute("COMMIT")
+    finally:
+        connection.close()
+
+def lease_jobs(shard, shards, limit):
+    """Lease up to `limit` runnable jobs of one shard; expired leases of crashed workers are taken over."""
+    now = time.time()
+    connection = connect()
+    try:
+        connection.execute("BEGIN IMMEDIATE")  # Serializes leasing between workers
+        rows = connection.execute(
+            """
+            SELECT id, payload FROM jobs
+            WHERE (status = 'pending' OR (status = 'leased' AND leased_until < ?)) AND host_key % ? = ?
+            ORDER BY id LIMIT ?
+            """,
+            (now, shards, shard, limit),
+        ).fetchall()
+        for job_id, _ in rows:
+            connection.execute(
+                "UPDATE jobs SET status = 'leased', attempts = attempts + 1, leased_until = ?, updated_at = ? WHERE id = ?",
+                (now + JOB_LEASE_SECONDS, now, job_id),
+            )
+        connection.execute("COMMIT")
+    finally:
+        connection.close()
+    return [(job_id, _payload_candidate(json.loads(payload))) for job_id, payload in rows]
+
+def complete_job(job_id):
+    """Mark a job as done."""
+    _set_status(job_id, "done", None)
+
+def fail_job(job_id, error):
+    """Return a failed job to the queue, or park it once it used up its attempts."""
+    connection = connect()
+    try:
+        connection.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, error = ?, updated_at = ? WHERE id = ?",
+            (JOB_MAX_ATTEMPTS, str(error), time.time(), job_id),
+        )
+    finally:
+        connection.close()
+
+def queue_stats():
+    """Return job counts by status."""
+    connection = connect()
+    try:
+        return dict(connection.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+    finally:
+        connection.close()
+
+def _set_status(job_id, status, error):
+    connection = connect()
+    try:
+        connection.execute("UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?", (status, error, time.time(), job_id))
+    finally:
+        connection.close()
+
+def _candidate_payload(candidate):
+    return {
+        "url": candidate.url,
+        "source": candidate.source,
+        "published": candidate.published.isoformat() if candidate.published else None,
+        "hints": candidate.hints,
+    }
+
+def _payload_candidate(payload):
+    published = datetime.fromisoformat(payload["published"]) if payload["published"] else None
+    return Candidate(payload["url"], payload["source"], published, payload["hints"])
@@ -0,0 +1,117 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from config.loggers import logger
+from config.settings import LOOP_LAG_INTERVAL_MS, LOOP_BLOCK_THRESHOLD_MS
+
+# Event-loop lag monitor. A task on the loop wakes every LOOP_LAG_INTERVAL_MS and records how late it
+# woke up (the lag). A watchdog thread watches the task's heartbeat; when the loop has not come round
+# for LOOP_BLOCK_THRESHOLD_MS it samples the loop thread's stack, which shows the blocking callback.
+
+STACK_DEPTH = 12  # Innermost frames kept per sample
+MAX_STACKS = 50  # Distinct blocking stacks kept
+
+class LoopMonitor:
+    def __init__(self, interval_ms=LOOP_LAG_INTERVAL_MS, threshold_ms=LOOP_BLOCK_THRESHOLD_MS):
+        self.interval = interval_ms / 1000
+        self.threshold = threshold_ms / 1000
+        self.samples = deque(maxlen=max(1, int(60 / self.interval)))  # Lag samples of the last minute
+        self.max_lag = 0.0
+        self.total_samples = 0
+        self.blocked_samples = 0  # Lag samples above the threshold
+        self.stacks = {}  # stack tuple -> {"samples", "first_seen", "last_seen"}
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id = None
+        self._task = None
+        self._stop = threading.Event()
+        self._watchdog = None
+
+    def start(self):
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._probe())
+        self._stop.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(f"Event-loop monitor started (interval {self.interval * 1000:g} ms, threshold {self.threshold * 1000:g} ms)")
+
+    def stop(self):
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+
+    async def _probe(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            self._heartbeat = now
+            self.samples.append(lag)
+            self.total_samples += 1
+            self.max_lag = max(self.max_lag, lag)
+            if lag >= self.threshold:
+                self.blocked_samples += 1
+
+    def _watch(self):
+        check_every = self.threshold / 2
+        while not self._stop.wait(check_every):
+            if time.monotonic() - self._heartbeat < self.interval + self.threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is not None:
+                self._record_stack(frame)
+
+    def _record_stack(self, frame):
+        stack = tuple(
+            f"{os.path.relpath(entry.filename) if not entry.filename.startswith('<') else entry.filename}:{entry.lineno} {entry.name}"
+            for entry in traceback.extract_stack(frame)[-STACK_DEPTH:]
+        )
+        now = time.time()
+        entry = self.stacks.get(stack)
+        if entry is None:
+            if len(self.stacks) >= MAX_STACKS:
+                return
+            entry = self.stacks[stack] = {"samples": 0, "first_seen": now}
+        entry["samples"] += 1
+        entry["last_seen"] = now
+
+    def stats(self, top=10):
+        """Lag percentiles of the last minute, totals since start and the most sampled blocking stacks."""
+        ordered = sorted(self.samples)
+
+        def percentile(fraction):
+            return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000, 2) if ordered else None
+
+        check_ms = self.threshold / 2 * 1000
+        blocking = sorted(self.stacks.items(), key=lambda item: item[1]["samples"], reverse=True)[:top]
+        return {
+            "pid": os.getpid(),
+            "interval_ms": self.interval * 1000,
+            "threshold_ms": self.threshold * 1000,
+            "last_minute": {"samples": len(ordered), "p50_ms": percentile(0.5), "p99_ms": percentile(0.99),
+                            "max_ms": round(ordered[-1] * 1000, 2) if ordered else None},
+            "since_start": {"samples": self.total_samples, "blocked_samples": self.blocked_samples,
+                            "max_ms": round(self.max_lag * 1000, 2)},
+            "blocking_stacks": [
+                {"samples": entry["samples"], "approx_blocked_ms": round(entry["samples"] * check_ms),
+                 "last_seen": entry["last_seen"], "stack": list(stack)}
+                for stack, entry in blocking
+            ],
+        }
+
+monitor = None  # The monitor of this process, started by main.py when LOOP_MONITOR is on
+
+def start_monitor():
+    global monitor
+    monitor = LoopMonitor()
+    monitor.start()
+    return monitor
+
+def stop_monitor():
+    if monitor:
+        monitor.stop()
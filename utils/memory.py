@@ -0,0 +1,110 @@
+import asyncio
+import resource
+import tracemalloc
+from contextlib import asynccontextmanager, contextmanager
+from bs4.element import Tag
+from config.loggers import logger
+from config.settings import MEMORY_BUDGET_MB, PARSED_DOCUMENT_FACTOR, MEMORY_TRACE
+from utils.tracing import span
+
+class DocumentBudget:
+    """Byte-weighted limit on the parsed documents alive at once in this process.
+
+    A document weighs its HTML size times PARSED_DOCUMENT_FACTOR, since a BeautifulSoup tree
+    takes several times the memory of its markup. A document heavier than the whole budget is
+    still let through when nothing else is in flight, so one large page cannot stall a run.
+    """
+
+    def __init__(self, limit_bytes):
+        self.limit = limit_bytes
+        self.in_use = 0
+        self.peak = 0
+        self._condition = None
+        self._loop = None
+
+    def _get_condition(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:  # asyncio primitives belong to the loop they were created in
+            self._condition = asyncio.Condition()
+            self._loop = loop
+        return self._condition
+
+    @asynccontextmanager
+    async def reserve(self, size):
+        weight = size * PARSED_DOCUMENT_FACTOR
+        condition = self._get_condition()
+        with span("wait_memory_budget"):
+            async with condition:
+                await condition.wait_for(lambda: self.in_use == 0 or self.in_use + weight <= self.limit)
+                self.in_use += weight
+                self.peak = max(self.peak, self.in_use)
+        try:
+            yield
+        finally:
+            self.in_use -= weight  # Released before awaiting, so a cancelled task cannot leak its share
+            async with condition:
+                condition.notify_all()
+
+document_budget = DocumentBudget(MEMORY_BUDGET_MB * 1024 * 1024) if MEMORY_BUDGET_MB else None
+
+@asynccontextmanager
+async def _unbounded():
+    yield
+
+def reserve_document(size):
+    """Wait until a document of `size` bytes of HTML fits in the memory budget and hold its share."""
+    if document_budget is None:
+        return _unbounded()
+    return document_budget.reserve(size)
+
+def release_document(*nodes):
+    """Free the trees holding `nodes` now instead of at the next garbage collection.
+
+    BeautifulSoup trees are full of parent/child reference cycles; decompose() breaks them so
+    the memory goes back as soon as extraction is done. Only call this once the values taken
+    from the tree are plain strings.
+    """
+    roots = {}
+    for node in nodes:
+        if not isinstance(node, Tag):
+            continue
+        while node.parent is not None:
+            node = node.parent
+        roots[id(node)] = node
+    for root in roots.values():
+        root.decompose()
+
+_active_traces = 0  # Traced runs in progress; the tracemalloc peak is only reset when none is
+
+@contextmanager
+def trace_peak(source, report):
+    """With MEMORY_TRACE, store the tracemalloc peak and peak RSS of the enclosed run in `report`.
+
+    tracemalloc keeps a single process-wide peak, so runs of several sources that overlap
+    (e.g. /runAllEndpoints) each report the peak of the whole overlapping window.
+    """
+    global _active_traces
+    if not MEMORY_TRACE:
+        yield
+        return
+
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if _active_traces == 0:
+        tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    _active_traces += 1
+    overlapping = _active_traces
+    try:
+        yield
+    finally:
+        overlapping = max(overlapping, _active_traces)
+        _active_traces -= 1
+        peak = tracemalloc.get_traced_memory()[1]
+        report[source] = {
+            "peak_traced_mb": round(max(peak - baseline, 0) / 1024 / 1024, 1),
+            "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),  # ru_maxrss is in kB on Linux
+            "overlapping_runs": overlapping,
+            "budget_peak_mb": round(document_budget.peak / 1024 / 1024, 1) if document_budget else None,
+        }
+        logger.info(f"Memory for {source}: {report[source]}")
@@ -0,0 +1,95 @@
+import html
+import json
+import re
+
+# Structured metadata read straight from the HTML text, without building a tree: schema.org JSON-LD
+# (NewsArticle and friends) anywhere in the page, and OpenGraph / author <meta> tags in <head>.
+
+LD_JSON_PATTERN = re.compile(r'<script[^>]*type\s*=\s*["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.S | re.I)
+META_PATTERN = re.compile(r'<meta\s[^>]*>', re.I)
+ATTRIBUTE_PATTERN = re.compile(r'([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+HEAD_END_PATTERN = re.compile(r'</head\s*>', re.I)
+
+ARTICLE_TYPES = {"Article", "NewsArticle", "ReportageNewsArticle", "AnalysisNewsArticle", "BlogPosting", "TechArticle"}
+MIN_BODY_LENGTH = 200  # Shorter articleBody values are teasers, not the article
+
+def extract_head_metadata(page_html):
+    """Return the title, author, content and imageURI found in JSON-LD and OpenGraph metadata (missing ones omitted)."""
+    fields = _json_ld_fields(page_html)
+    head_end = HEAD_END_PATTERN.search(page_html)
+    for name, value in _meta_fields(page_html[:head_end.start()] if head_end else page_html).items():
+        fields.setdefault(name, value)
+    return {name: value for name, value in fields.items() if value}
+
+def _json_ld_fields(page_html):
+    nodes = []
+    for block in LD_JSON_PATTERN.findall(page_html):
+        try:
+            data = json.loads(block.strip())
+        except ValueError:
+            continue  # Sites occasionally ship broken JSON-LD; the DOM extractor covers it
+        nodes.extend(_flatten_nodes(data))
+    by_id = {node["@id"]: node for node in nodes if isinstance(node.get("@id"), str)}
+
+    for node in nodes:
+        types = node.get("@type")
+        types = set(types) if isinstance(types, list) else {types}
+        if not types & ARTICLE_TYPES:
+            continue
+        body = _text(node.get("articleBody"))
+        return {
+            "title": _text(node.get("headline") or node.get("name")),
+            "author": _author_names(node.get("author"), by_id),
+            "content": body if body and len(body) >= MIN_BODY_LENGTH else None,
+            "imageURI": _image_url(node.get("image"), by_id),
+        }
+    return {}
+
+def _flatten_nodes(data):
+    if isinstance(data, list):
+        return [node for item in data for node in _flatten_nodes(item)]
+    if not isinstance(data, dict):
+        return []
+    return [data] + _flatten_nodes(data.get("@graph", []))
+
+def _resolve(value, by_id):
+    if isinstance(value, dict) and set(value) == {"@id"}:
+        return by_id.get(value["@id"], value)  # Yoast-style graphs reference the Person node by id
+    return value
+
+def _author_names(value, by_id):
+    values = value if isinstance(value, list) else [value]
+    names = []
+    for author in values:
+        author = _resolve(author, by_id)
+        name = author.get("name") if isinstance(author, dict) else author
+        if isinstance(name, str) and name.strip():
+            names.append(_text(name))
+    return ", ".join(names) or None
+
+def _image_url(value, by_id):
+    if isinstance(value, list):
+        value = value[0] if value else None
+    value = _resolve(value, by_id)
+    if isinstance(value, dict):
+        value = value.get("url") or value.get("contentUrl")
+    return value if isinstance(value, str) else None
+
+def _meta_fields(head_html):
+    fields = {}
+    for tag in META_PATTERN.findall(head_html):
+        attributes = {name.lower(): double or single for name, double, single in ATTRIBUTE_PATTERN.findall(tag)}
+        key = attributes.get("property") or attributes.get("name")
+        content = attributes.get("content")
+        if not key or not content:
+            continue
+        if key == "og:title":
+            fields.setdefault("title", _text(content))
+        elif key in ("author", "article:author") and not content.startswith("http"):
+            fields.setdefault("author", _text(content))
+        elif key == "og:image":
+            fields.setdefault("imageURI", content)
+    return fields
+
+def _text(value):
+    return html.unescape(value).strip() if isinstance(value, str) else None
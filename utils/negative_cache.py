@@ -0,0 +1,74 @@
+import sqlite3
+import time
+from config.settings import NEGATIVE_CACHE_PATH, NEGATIVE_CACHE_TTLS, NEGATIVE_CACHE_MAX_SECONDS
+
+# URLs that recently failed (non-200, fetch error, incomplete article) and are not worth another request yet.
+# Each reason has its own base TTL; every further failure in a row doubles it, up to NEGATIVE_CACHE_MAX_SECONDS.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS failures (
+    url TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    reason TEXT NOT NULL,
+    failures INTEGER NOT NULL,
+    retry_after REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS failures_source ON failures (source, retry_after);
+"""
+
+_schema_ready = False
+
+def connect():
+    """Open a connection to the negative cache, creating the schema on first use."""
+    global _schema_ready
+    connection = sqlite3.connect(NEGATIVE_CACHE_PATH, timeout=30)
+    connection.execute("PRAGMA journal_mode=WAL")
+    if not _schema_ready:
+        connection.executescript(SCHEMA)
+        _schema_ready = True
+    return connection
+
+def failure_reason(status):
+    """Map an HTTP status to a failure reason: missing pages stay bad far longer than overloaded servers."""
+    return "http_4xx" if 400 <= status < 500 else "http_5xx"
+
+def blocked_urls(source):
+    """Return the URLs of a source whose retry time has not come yet."""
+    connection = connect()
+    try:
+        rows = connection.execute("SELECT url FROM failures WHERE source = ? AND retry_after > ?", (source, time.time()))
+        return {url for (url,) in rows}
+    finally:
+        connection.close()
+
+def record_failure(url, source, reason):
+    """Count a failure; repeated failures extend the blocking time exponentially."""
+    now = time.time()
+    base_ttl = NEGATIVE_CACHE_TTLS.get(reason, NEGATIVE_CACHE_TTLS["error"])
+    connection = connect()
+    try:
+        with connection:
+            row = connection.execute("SELECT failures FROM failures WHERE url = ?", (url,)).fetchone()
+            failures = row[0] + 1 if row else 1
+            ttl = min(base_ttl * 2 ** (failures - 1), NEGATIVE_CACHE_MAX_SECONDS)
+            connection.execute(
+                """
+                INSERT INTO failures (url, source, reason, failures, retry_after, updated_at) VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (url) DO UPDATE SET
+                    source = excluded.source, reason = excluded.reason, failures = excluded.failures,
+                    retry_after = excluded.retry_after, updated_at = excluded.updated_at
+                """,
+                (url, source, reason, failures, now + ttl, now),
+            )
+    finally:
+        connection.close()
+
+def clear_failures(url):
+    """Forget a URL's failures after it produced a complete article (whichever process recorded them)."""
+    connection = connect()
+    try:
+        with connection:
+            connection.execute("DELETE FROM failures WHERE url = ?", (url,))
+    finally:
+        connection.close()
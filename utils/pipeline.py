@@ -0,0 +1,328 @@
+import asyncio
+import inspect
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+import aiohttp
+from bs4 import BeautifulSoup
+from config.loggers import logger
+from config.settings import PIPELINE_CONCURRENCY, FEED_SOURCES, NEGATIVE_CACHE
+from utils.feeds import FeedEntries, fetch_feed_entries
+from utils.frontier import build_frontier, build_frontier_from_feed, build_frontier_from_links
+from utils.archive import archive_response
+from utils.memory import reserve_document, release_document, trace_peak
+from utils.metadata import extract_head_metadata
+from utils.negative_cache import blocked_urls, record_failure, clear_failures, failure_reason
+from utils.store import save_articles
+from utils.stream import notify_new_articles
+from utils.tracing import span
+from utils.utils import create_article, log_article_counts, log_incomplete_article, headers, upstream_url
+
+# Scraping pipeline shared by all sources:
+#   discover -> filter -> fetch -> metadata -> parse -> extract -> build -> sink
+# Sources plug in as a SourceSpec. Every stage is a plain function looked up in STAGES, so a
+# stage can be replaced for all sources (set_stage), for one source (SourceSpec.stages) or for
+# one run (run_pipeline(stages=...)). Stages may be sync or async; each call is timed. parse and extract
+# are skipped when the page's JSON-LD/OpenGraph metadata already supplies every required field.
+
+EXTRACTED_FIELDS = ("title", "author", "content", "imageURI")  # Order of the values returned by extractors
+REQUIRED_FIELDS = ("title", "author", "content")
+
+@dataclass
+class SourceSpec:
+    """What is specific to one source; the pipeline supplies everything else."""
+    key: str  # Registry key, also used by the frontier and the store
+    name: str  # Value of metadata.articleSource
+    discover: Callable  # async (session) -> sitemap <url> tags or article links, None on failure
+    extract: Callable  # (page_soup) -> (title, author, content[, imageURI])
+    frontier: Optional[dict] = None  # build_frontier options; None means discover returns plain links
+    headers: Optional[dict] = None  # Session headers replacing the defaults from utils
+    parser: str = 'html.parser'
+    request_delay: float = 0  # Seconds to wait before each article request
+    published_from_sitemap: bool = False  # Take metadata.articlePublishedOn from the sitemap date
+    metadata_fields: tuple = ()  # Fields trusted from the page's JSON-LD/OpenGraph over the DOM extractor
+    feed_url: Optional[str] = None  # RSS/Atom feed used instead of discover when the source is in FEED_SOURCES
+    discover_error: str = "Failed to fetch sitemap."
+    stages: dict = field(default_factory=dict)  # Stage overrides for this source only
+
+class FetchError(Exception):
+    """The fetch stage got a non-200 response for an article page."""
+
+    def __init__(self, url, status):
+        super().__init__(f"Received status code {status} for {url}")
+        self.status = status
+
+class StageTimer:
+    """Accumulates wall time and call counts per stage for one pipeline run."""
+
+    def __init__(self):
+        self.seconds = defaultdict(float)
+        self.calls = defaultdict(int)
+
+    async def call(self, stage, function, *args):
+        start = time.perf_counter()
+        try:
+            with span(stage):
+                result = function(*args)
+                if inspect.isawaitable(result):
+                    result = await result
+                return result
+        finally:
+            self.seconds[stage] += time.perf_counter() - start
+            self.calls[stage] += 1
+
+    def as_dict(self):
+        return {stage: {"seconds": round(self.seconds[stage], 4), "calls": self.calls[stage]} for stage in self.seconds}
+
+    def summary(self):
+        return " ".join(f"{stage}={self.seconds[stage]:.3f}s/{self.calls[stage]}" for stage in self.seconds)
+
+last_timings = {}  # Stage timings of the latest run, by source key
+last_memory = {}  # Peak memory of the latest run with MEMORY_TRACE, by source key
+
+def uses_feed(spec):
+    return bool(spec.feed_url) and ("all" in FEED_SOURCES or spec.key in FEED_SOURCES)
+
+async def discover_stage(spec, session):
+    if uses_feed(spec):
+        entries = await fetch_feed_entries(session, spec.feed_url)
+        if entries is not None:
+            return entries
+        logger.warning(f"Feed of {spec.key} unavailable, falling back to its regular discovery")
+    return await spec.discover(session)
+
+async def filter_stage(spec, entries):
+    # URLs that failed recently are looked up off the event loop, then dropped before the frontier's cap
+    blocked = await asyncio.to_thread(blocked_urls, spec.key) if NEGATIVE_CACHE else frozenset()
+    if isinstance(entries, FeedEntries):
+        return build_frontier_from_feed(entries, spec.key, days=(spec.frontier or {}).get('days', 2), blocked=blocked)
+    if spec.frontier is None:
+        return build_frontier_from_links(entries, spec.key, blocked=blocked)
+    return build_frontier(entries, spec.key, blocked=blocked, **spec.frontier)
+
+async def fetch_stage(spec, session, candidate):
+    if spec.request_delay:
+        await asyncio.sleep(spec.request_delay)  # Add a delay between requests
+    async with session.get(upstream_url(candidate.url)) as response:
+        if response.status == 200:
+            html = await response.text()
+            await archive_response("page", candidate.url, html, spec.key, candidate)
+            return html
+        raise FetchError(candidate.url, response.status)
+
+def metadata_stage(spec, html, candidate):
+    if not spec.metadata_fields:
+        return {}
+    metadata = extract_head_metadata(html)
+    return {name: metadata[name] for name in spec.metadata_fields if metadata.get(name)}
+
+def needs_dom(fields):
+    """Whether the DOM extractor must run because a required field is still missing."""
+    return any(not fields.get(name) for name in REQUIRED_FIELDS)
+
+async def note_failure(spec, candidate, reason):
+    """Put a failing URL in the negative cache so the next runs skip it for a while."""
+    if NEGATIVE_CACHE:
+        try:
+            await asyncio.to_thread(record_failure, candidate.url, spec.key, reason)
+        except Exception as e:
+            logger.error(f"Failed to record failure of {candidate.url}: {e}")
+
+def parse_stage(spec, html):
+    return BeautifulSoup(html, spec.parser)
+
+def extract_stage(spec, page_soup, candidate):
+    fields = dict(candidate.hints)  # Sitemap hints (e.g. news:title) serve as defaults for page fields
+    for name, value in zip(EXTRACTED_FIELDS, spec.extract(page_soup)):
+        if value:
+            fields[name] = value
+    return fields
+
+def build_stage(spec, candidate, fields):
+    title, author, content = fields.get("title"), fields.get("author"), fields.get("content")
+
+    # Ensure all required details are present before creating the article
+    if not (title and content and author):
+        log_incomplete_article(candidate.url, title, content, author)
+        return None
+
+    article = create_article(title, candidate.url, author, content, spec.name)
+    if fields.get("imageURI"):
+        article["imageURI"] = fields["imageURI"]
+    if spec.published_from_sitemap and candidate.published:
+        article["metadata"]["articlePublishedOn"] = candidate.published.strftime("%B %d, %Y")
+    return article
+
+async def sink_stage(spec, article):
+    # Store every article as soon as it is built, so /stream/articles can push it right away
+    await asyncio.to_thread(save_articles, spec.key, [article])
+    notify_new_articles()
+
+STAGES = {
+    "discover": discover_stage,
+    "filter": filter_stage,
+    "fetch": fetch_stage,
+    "metadata": metadata_stage,
+    "parse": parse_stage,
+    "extract": extract_stage,
+    "build": build_stage,
+    "sink": sink_stage,
+}
+
+def set_stage(name, function):
+    """Replace a stage for every source."""
+    if name not in STAGES:
+        raise KeyError(f"Unknown pipeline stage: {name}")
+    STAGES[name] = function
+
+def resolve_stages(spec, overrides=None):
+    stages = dict(STAGES)
+    stages.update(spec.stages)
+    if overrides:
+        stages.update(overrides)
+    return stages
+
+async def discover_candidates(spec, session, timer=None, stages=None):
+    """Run the discover and filter stages; returns the candidates or None if discovery failed."""
+    timer = timer or StageTimer()
+    stages = stages or resolve_stages(spec)
+    entries = await timer.call("discover", stages["discover"], spec, session)
+    if entries is None:
+        return None
+    candidates = await timer.call("filter", stages["filter"], spec, entries)
+    release_document(*entries)  # Candidates only hold strings, so the sitemap trees can go
+    return candidates
+
+async def fetch_page_fields(spec, session, candidate, timer, stages):
+    """Fetch the candidate's page and read its fields from metadata, then the DOM; None if the fetch failed."""
+    html = await timer.call("fetch", stages["fetch"], spec, session, candidate)
+    if not html:
+        return None
+    metadata = await timer.call("metadata", stages["metadata"], spec, html, candidate)
+    fields = {**candidate.hints, **metadata}
+    if needs_dom(fields):
+        async with reserve_document(len(html)):
+            page_soup = await timer.call("parse", stages["parse"], spec, html)
+            html = None  # The tree replaces the markup
+            try:
+                fields = await timer.call("extract", stages["extract"], spec, page_soup, candidate)
+            finally:
+                release_document(page_soup)  # Free the tree right after extraction
+                page_soup = None
+        fields.update(metadata)  # The DOM only fills what the metadata lacks
+    return fields
+
+async def process_candidate(spec, session, candidate, timer=None, stages=None, raise_errors=False):
+    """Run fetch through sink for one candidate; returns the article or None.
+
+    Fetch errors and exceptions are logged and give None, or are re-raised with `raise_errors` (crawl
+    workers retry those jobs); an incomplete article is never an error.
+    """
+    timer = timer or StageTimer()
+    stages = stages or resolve_stages(spec)
+    try:
+        with span("article", source=spec.key, url=candidate.url):
+            fields = dict(candidate.hints)
+            if needs_dom(fields):  # Complete feed entries carry every field and skip the page request
+                fields = await fetch_page_fields(spec, session, candidate, timer, stages)
+                if fields is None:
+                    return None
+            article = await timer.call("build", stages["build"], spec, candidate, fields)
+            if not article:
+                await note_failure(spec, candidate, "incomplete")
+                return None
+            await timer.call("sink", stages["sink"], spec, article)
+            if NEGATIVE_CACHE:
+                await asyncio.to_thread(clear_failures, candidate.url)
+            return article
+    except FetchError as e:
+        logger.error(f"Failed to fetch page content for URL: {candidate.url} (status {e.status})")
+        await note_failure(spec, candidate, failure_reason(e.status))
+        if raise_errors:
+            raise
+        return None
+    except Exception as e:
+        logger.error(f"Error fetching article from {candidate.url}: {e}")  # Log any errors encountered while fetching the article
+        await note_failure(spec, candidate, "error")
+        if raise_errors:
+            raise
+        return None
+
+async def run_pipeline(spec, stages=None, limit=None):
+    """Scrape one source end to end; returns the list of articles or an error dict like the old routers.
+
+    With `limit`, candidates are processed newest first and the run stops once `limit` articles are complete.
+    """
+    stages = resolve_stages(spec, stages)
+    timer = StageTimer()
+    try:
+        with span("source", source=spec.key, limit=limit), trace_peak(spec.key, last_memory):
+            return await _run_source(spec, stages, timer, limit)
+    finally:
+        last_timings[spec.key] = timer.as_dict()
+        logger.info(f"Pipeline timings for {spec.key}: {timer.summary()}")
+
+async def first_complete(coroutines, limit):
+    """Run the coroutines concurrently until `limit` of them returned an article, then cancel the rest.
+
+    Returns (articles in submission order, number of coroutines that finished without an article).
+    """
+    async def indexed(index, coroutine):
+        return index, await coroutine
+
+    tasks = [asyncio.ensure_future(indexed(index, coroutine)) for index, coroutine in enumerate(coroutines)]
+    found, failed = {}, 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            index, article = await next_done
+            if not article:
+                failed += 1
+                continue
+            found[index] = article
+            if len(found) >= limit:
+                break
+    finally:
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()  # In-flight fetches are aborted, queued candidates never start
+        await asyncio.gather(*pending, return_exceptions=True)  # Let them unwind before the session closes
+    if pending:
+        logger.info(f"Cancelled {len(pending)} outstanding candidates after {len(found)} complete articles")
+    return [found[index] for index in sorted(found)], failed
+
+async def _run_source(spec, stages, timer, limit=None):
+    try:
+        async with aiohttp.ClientSession(headers=spec.headers or headers) as session:
+            candidates = await discover_candidates(spec, session, timer, stages)
+            if candidates is None:
+                return {"error": spec.discover_error}
+
+            # Candidates come newest first; with a limit, only that many are in flight at once so the
+            # newest pages are fetched first and little work is thrown away on cancellation
+            concurrency = PIPELINE_CONCURRENCY or limit
+            semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+
+            async def process(candidate):
+                if semaphore is None:
+                    return await process_candidate(spec, session, candidate, timer, stages)
+                with span("wait_concurrency_slot"):
+                    await semaphore.acquire()
+                try:
+                    return await process_candidate(spec, session, candidate, timer, stages)
+                finally:
+                    semaphore.release()
+
+            if limit:
+                articles, incomplete = await first_complete((process(candidate) for candidate in candidates), limit)
+            else:
+                results = await asyncio.gather(*(process(candidate) for candidate in candidates))
+                articles = [article for article in results if article]
+                incomplete = len(results) - len(articles)
+
+            # Log the counts of articles
+            log_article_counts(len(articles), len(articles), incomplete)
+            return articles
+    except Exception as e:
+        logger.error(f"Error: {e}")  # Log any errors encountered during the process
+        return {"error": str(e)}
@@ -0,0 +1,40 @@
+# Field projection for article responses: ?fields=title,link,metadata.articleSource keeps only those
+# paths of every article, so the large content string is never serialized for clients that skip it.
+
+def parse_fields(spec):
+    """Turn "title,metadata.articleSource" into {"title": None, "metadata": {"articleSource": None}}.
+
+    None marks a field kept whole; an empty or missing spec returns None (no projection).
+    """
+    if not spec:
+        return None
+    tree = {}
+    for path in spec.split(","):
+        names = [name.strip() for name in path.split(".") if name.strip()]
+        if not names:
+            continue
+        node = tree
+        for name in names[:-1]:
+            child = node.setdefault(name, {})
+            if child is None:
+                break  # A parent path was already requested whole
+            node = child
+        else:
+            node[names[-1]] = None
+    return tree or None
+
+def project(value, tree):
+    """Keep only the paths of `tree` in a dict (or in every dict of a list); missing paths are left out."""
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [project(item, tree) for item in value]
+    if not isinstance(value, dict):
+        return value
+    return {name: project(value[name], subtree) for name, subtree in tree.items() if name in value}
+
+def canonical_fields(tree):
+    """A stable string for a projection, used to tell the ETags of different projections apart."""
+    if tree is None:
+        return ""
+    return ",".join(name if subtree is None else f"{name}({canonical_fields(subtree)})" for name, subtree in sorted(tree.items()))
@@ -0,0 +1,130 @@
+import asyncio
+import fcntl
+import functools
+import os
+import aiohttp
+from config.loggers import logger
+from config.settings import SERVING_MODE, SCRAPE_INTERVAL_SECONDS, LEADER_RETRY_SECONDS, SCRAPER_LOCK_PATH, ADAPTIVE_SCHEDULE
+from utils.cadence import due_sources, mark_scraped, mark_failed, seconds_until_due, start_observing, stop_observing, record_observations
+from utils.frontier import start_run, end_run
+from utils.job_queue import enqueue_candidates
+from utils.pipeline import discover_candidates
+from utils.store import load_articles
+from utils.utils import headers
+
+_lock_file = None  # Open handle on the scraper lock while this process is the elected scraper
+SCHEDULE_TICK_SECONDS = 60  # Longest sleep of the adaptive schedule, so cadence changes made elsewhere are picked up
+
+def shared_results(source):
+    """Serve a scrape endpoint from the shared store when SERVING_MODE is "shared".
+
+    The undecorated scraper stays reachable as `endpoint.scrape` for the elected worker.
+    """
+    def decorator(scrape):
+        @functools.wraps(scrape)
+        async def endpoint(*args, **kwargs):
+            if SERVING_MODE == "shared":
+                return await asyncio.to_thread(load_articles, source, kwargs.get("limit"))
+            return await scrape(*args, **kwargs)
+
+        endpoint.scrape = scrape
+        return endpoint
+    return decorator
+
+def try_become_scraper():
+    """Try to take the scraper lock; only one worker process can hold it at a time."""
+    global _lock_file
+    if _lock_file is not None:
+        return True
+    lock_file = open(SCRAPER_LOCK_PATH, "a+")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        return False
+    _lock_file = lock_file
+    logger.info(f"Worker {os.getpid()} elected as scraper")
+    return True
+
+def release_scraper():
+    """Give up the scraper lock so another worker can take over."""
+    global _lock_file
+    if _lock_file is not None:
+        fcntl.flock(_lock_file, fcntl.LOCK_UN)
+        _lock_file.close()
+        _lock_file = None
+
+async def scrape_round(scrapers):
+    """Run every scraper once; the pipeline's sink stage writes each article to the shared store.
+
+    Returns the sources whose scrape succeeded.
+    """
+    frontier_run = start_run()
+    try:
+        sources = list(scrapers)
+        results = await asyncio.gather(*(scrapers[source]() for source in sources), return_exceptions=True)
+    finally:
+        end_run(frontier_run)
+
+    succeeded = []
+    for source, result in zip(sources, results):
+        if isinstance(result, list):
+            logger.info(f"Stored {len(result)} articles for {source}")
+            succeeded.append(source)
+        else:
+            logger.error(f"Scheduled scrape of {source} failed: {result}")
+    return succeeded
+
+async def dispatch_round(specs):
+    """Discover candidates for every source and queue them as jobs for the crawl workers.
+
+    Returns the sources whose discovery succeeded.
+    """
+    succeeded = []
+    frontier_run = start_run()
+    try:
+        for source, spec in specs.items():
+            try:
+                async with aiohttp.ClientSession(headers=spec.headers or headers) as session:
+                    candidates = await discover_candidates(spec, session)
+            except Exception as e:
+                logger.error(f"Discovery for {source} failed: {e}")
+                continue
+            succeeded.append(source)
+            if candidates:
+                await asyncio.to_thread(enqueue_candidates, candidates)
+                logger.info(f"Queued {len(candidates)} jobs for {source}")
+    finally:
+        end_run(frontier_run)
+    return succeeded
+
+async def run_scraper_schedule(round_function, sources):
+    """Keep trying to become the scraper; once elected, run `round_function` over due sources until cancelled.
+
+    `sources` returns the keys to schedule and `round_function` the keys that ran successfully. With
+    ADAPTIVE_SCHEDULE each source is due on its own cadence (utils/cadence.py) and a failed source is retried
+    after CADENCE_MIN_SECONDS; otherwise all of them run every SCRAPE_INTERVAL_SECONDS.
+    """
+    try:
+        while True:
+            if not try_become_scraper():
+                await asyncio.sleep(LEADER_RETRY_SECONDS)
+            elif not ADAPTIVE_SCHEDULE:
+                await round_function(sources())
+                await asyncio.sleep(SCRAPE_INTERVAL_SECONDS)
+            else:
+                keys = sources()
+                due = await asyncio.to_thread(due_sources, keys)
+                if due:
+                    observed, token = start_observing()  # Only scheduled rounds feed the publish rates
+                    try:
+                        succeeded = await round_function(due)
+                    finally:
+                        stop_observing(token)
+                    await asyncio.to_thread(record_observations, observed)
+                    await asyncio.to_thread(mark_scraped, succeeded)
+                    await asyncio.to_thread(mark_failed, [key for key in due if key not in succeeded])
+                wait = await asyncio.to_thread(seconds_until_due, keys)
+                await asyncio.sleep(min(max(wait, 1), SCHEDULE_TICK_SECONDS))
+    finally:
+        release_scraper()
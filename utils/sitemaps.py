@@ -0,0 +1,130 @@
+import asyncio
+import json
+import re
+import time
+from datetime import datetime, timedelta
+import aiohttp
+from config.loggers import logger
+from config.settings import DATA_DIR, SITEMAP_POINTER_TTL_SECONDS
+from utils.files import write_json_atomic
+from utils.utils import fetch_sitemap
+
+SITEMAP_POINTER_CACHE_PATH = DATA_DIR / "sitemap_pointers.json"
+
+_pointer_cache = None  # {index_url: {"children": [...], "checkedAt": epoch seconds}}, loaded on first use
+
+def parse_sitemap_date(text):
+    """Parse a sitemap date (W3C datetime or plain date) into a naive local datetime, or None."""
+    if not text:
+        return None
+    text = text.strip()
+    try:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            parsed = datetime.strptime(text[:10], "%Y-%m-%d")
+        except ValueError:
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)  # Compare against datetime.now() like the routers do
+    return parsed
+
+def parse_sitemap_index(soup, child_pattern=None):
+    """Return the (loc, lastmod) child sitemaps of an index, newest first."""
+    children = []
+    for sitemap_tag in soup.find_all('sitemap'):
+        loc_tag = sitemap_tag.find('loc')
+        if not loc_tag:
+            continue
+        loc = loc_tag.text.strip()
+        if child_pattern and child_pattern not in loc:
+            continue
+        lastmod_tag = sitemap_tag.find('lastmod')
+        children.append((loc, parse_sitemap_date(lastmod_tag.text) if lastmod_tag else None))
+
+    # Sort by lastmod, falling back to the number in numbered sitemaps (post-sitemap34.xml > post-sitemap33.xml)
+    children.sort(key=lambda child: (child[1] or datetime.min, _sitemap_number(child[0])), reverse=True)
+    return children
+
+def select_fresh_children(children, since):
+    """Keep the children that may hold articles modified at or after `since` (always at least the newest)."""
+    fresh = [loc for loc, lastmod in children if lastmod and lastmod >= since]
+    if not fresh and children:
+        fresh = [children[0][0]]
+    return fresh
+
+async def discover_latest_sitemaps(session, index_url, child_pattern, fallback_url, days=2):
+    """Return the child sitemap URLs worth fetching, using the cached pointer while it is fresh."""
+    cached = _load_pointer_cache().get(index_url)
+    if cached and time.time() - cached["checkedAt"] < SITEMAP_POINTER_TTL_SECONDS:
+        return cached["children"]
+
+    index_soup = await _fetch_or_none(session, index_url)
+    if index_soup:
+        children = parse_sitemap_index(index_soup, child_pattern)
+        since = datetime.combine(datetime.now().date() - timedelta(days=days - 1), datetime.min.time())
+        fresh = select_fresh_children(children, since)
+        if fresh:
+            logger.info(f"Sitemap index {index_url} points to {', '.join(fresh)}")
+            _store_pointer(index_url, fresh)
+            return fresh
+        logger.warning(f"No child sitemaps matching '{child_pattern}' found in {index_url}")
+
+    # Index unavailable or unreachable: reuse the last known pointer even if stale, otherwise the hardcoded sitemap
+    if cached:
+        return cached["children"]
+    return [fallback_url]
+
+async def fetch_fresh_url_tags(session, index_url, child_pattern, fallback_url, days=2):
+    """Fetch the fresh child sitemaps of an index and return their <url> tags, or None if none could be fetched."""
+    sitemap_urls = await discover_latest_sitemaps(session, index_url, child_pattern, fallback_url, days)
+    soups = await asyncio.gather(*(_fetch_or_none(session, sitemap_url) for sitemap_url in sitemap_urls))
+
+    if not all(soups):
+        invalidate_pointer(index_url)  # A child vanished or moved; rediscover on the next run
+    if not any(soups):
+        return None
+
+    url_tags = []
+    for soup in soups:
+        if soup:
+            url_tags.extend(soup.find_all('url'))
+    return url_tags
+
+def invalidate_pointer(index_url):
+    """Forget the cached pointer for an index so the next run re-reads it."""
+    cache = _load_pointer_cache()
+    if cache.pop(index_url, None) is not None:
+        _save_pointer_cache(cache)
+
+async def _fetch_or_none(session, sitemap_url):
+    # A connection error or timeout takes the same fallbacks as an error status
+    try:
+        return await fetch_sitemap(session, sitemap_url)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.error(f"Failed to fetch the sitemap {sitemap_url}: {e!r}")
+        return None
+
+def _sitemap_number(loc):
+    match = re.search(r'(\d+)\.xml', loc)
+    return int(match.group(1)) if match else 0
+
+def _load_pointer_cache():
+    global _pointer_cache
+    if _pointer_cache is None:
+        try:
+            _pointer_cache = json.loads(SITEMAP_POINTER_CACHE_PATH.read_text())
+        except (OSError, ValueError):
+            _pointer_cache = {}
+    return _pointer_cache
+
+def _store_pointer(index_url, children):
+    cache = _load_pointer_cache()
+    cache[index_url] = {"children": children, "checkedAt": time.time()}
+    _save_pointer_cache(cache)
+
+def _save_pointer_cache(cache):
+    try:
+        write_json_atomic(SITEMAP_POINTER_CACHE_PATH, cache)
+    except OSError as e:
+        logger.error(f"Failed to save sitemap pointer cache: {e}")
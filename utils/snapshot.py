@@ -0,0 +1,116 @@
+import json
+import mmap
+import struct
+import zlib
+
+# Daily snapshot file of scraped articles, laid out so metadata can be scanned without touching content:
+#
+#   MAGIC | content blocks ... | column block | FOOTER
+#
+# Every article's content is its own zlib block. The column block is zlib-compressed JSON holding one
+# list per field (title, link, metadata.author, ...) plus the offset and length of each content block.
+# The fixed-size footer points at the column block, so a reader maps the file, reads the footer and
+# only inflates the content blocks it asks for.
+
+MAGIC = b"ARTSNAP1"
+FOOTER = struct.Struct("<QQ8s")  # column block offset, column block length, magic
+CONTENT_FIELD = "content"
+
+def _flatten(article):
+    row = {}
+    for name, value in article.items():
+        if name == CONTENT_FIELD:
+            continue
+        if name == "metadata" and isinstance(value, dict):
+            for meta_name, meta_value in value.items():
+                row[f"metadata.{meta_name}"] = meta_value
+        else:
+            row[name] = value
+    return row
+
+def write_snapshot(path, articles, level=6):
+    """Write articles to a snapshot file; returns the number of articles written."""
+    rows = [_flatten(article) for article in articles]
+    names = []
+    for row in rows:
+        for name in row:
+            if name not in names:
+                names.append(name)
+    columns = {name: [row.get(name) for row in rows] for name in names}
+    offsets, lengths = [], []
+
+    with open(path, "wb") as snapshot_file:
+        snapshot_file.write(MAGIC)
+        for article in articles:
+            block = zlib.compress(str(article.get(CONTENT_FIELD) or "").encode(), level)
+            offsets.append(snapshot_file.tell())
+            lengths.append(len(block))
+            snapshot_file.write(block)
+
+        column_block = zlib.compress(json.dumps({
+            "count": len(articles),
+            "columns": columns,
+            "content_offsets": offsets,
+            "content_lengths": lengths,
+        }).encode(), level)
+        column_offset = snapshot_file.tell()
+        snapshot_file.write(column_block)
+        snapshot_file.write(FOOTER.pack(column_offset, len(column_block), MAGIC))
+    return len(articles)
+
+class Snapshot:
+    """Memory-mapped reader of a snapshot file; content is inflated one article at a time."""
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not an article snapshot")
+        column_offset, column_length, magic = FOOTER.unpack(self._map[-FOOTER.size:])
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} has no snapshot footer (truncated file?)")
+        header = json.loads(zlib.decompress(self._map[column_offset:column_offset + column_length]))
+        self.columns = header["columns"]
+        self._offsets = header["content_offsets"]
+        self._lengths = header["content_lengths"]
+        self._count = header["count"]
+
+    def __len__(self):
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def column(self, name):
+        """Return all values of one field, e.g. "title" or "metadata.author"."""
+        return self.columns.get(name, [None] * self._count)
+
+    def content(self, index):
+        """Inflate the content of one article."""
+        offset = self._offsets[index]
+        return zlib.decompress(self._map[offset:offset + self._lengths[index]]).decode()
+
+    def article(self, index, with_content=True):
+        """Rebuild the article dict at `index`."""
+        article = {}
+        for name, values in self.columns.items():
+            if name.startswith("metadata."):
+                article.setdefault("metadata", {})[name[len("metadata."):]] = values[index]
+            else:
+                article[name] = values[index]
+        if with_content:
+            article[CONTENT_FIELD] = self.content(index)
+        return article
+
+    def articles(self, with_content=True):
+        for index in range(self._count):
+            yield self.article(index, with_content)
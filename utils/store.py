@@ -0,0 +1,188 @@
+import json
+import re
+import sqlite3
+import time
+from config.settings import STORE_PATH, STORE_RESULT_TTL_SECONDS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    link TEXT NOT NULL UNIQUE,
+    source TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    first_seen_at REAL NOT NULL,
+    last_seen_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_source_seen ON articles (source, last_seen_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, author, content, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+# Full-text index rows share their rowid with articles.seq
+SEARCH_FIELDS = ("title", "author", "content")
+SEARCH_WEIGHTS = (10.0, 5.0, 1.0)  # bm25 weight of a match in the title, author and content
+
+_schema_ready = False
+
+def connect():
+    """Open a connection to the shared store, creating the schema on first use."""
+    global _schema_ready
+    connection = sqlite3.connect(STORE_PATH, timeout=30)
+    connection.execute("PRAGMA journal_mode=WAL")  # Readers in other workers never block the writer
+    if not _schema_ready:
+        connection.executescript(SCHEMA)
+        _backfill_search_index(connection)
+        _schema_ready = True
+    return connection
+
+def _backfill_search_index(connection):
+    # Index the articles stored before the full-text index existed
+    connection.execute("BEGIN IMMEDIATE")  # Only one worker backfills
+    try:
+        if connection.execute("SELECT 1 FROM articles_fts LIMIT 1").fetchone() is None:
+            connection.execute(
+                """
+                INSERT INTO articles_fts (rowid, title, author, content)
+                SELECT seq, json_extract(payload, '$.title'), json_extract(payload, '$.metadata.author'),
+                       json_extract(payload, '$.content')
+                FROM articles
+                """
+            )
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+
+def _search_values(article):
+    return (article.get("title"), article.get("metadata", {}).get("author"), article.get("content"))
+
+def save_articles(source, articles):
+    """Insert or refresh articles of a source; known links keep their original articleId."""
+    now = time.time()
+    connection = connect()
+    try:
+        with connection:
+            for article in articles:
+                row = connection.execute("SELECT seq, payload FROM articles WHERE link = ?", (article["link"],)).fetchone()
+                if row:
+                    seq, stored = row[0], json.loads(row[1])
+                    article["articleId"] = stored["articleId"]
+                    connection.execute(
+                        "UPDATE articles SET source = ?, payload = ?, last_seen_at = ? WHERE seq = ?",
+                        (source, json.dumps(article), now, seq),
+                    )
+                    if _search_values(article) != _search_values(stored):  # Re-index only edited articles
+                        connection.execute(
+                            "UPDATE articles_fts SET title = ?, author = ?, content = ? WHERE rowid = ?",
+                            (*_search_values(article), seq),
+                        )
+                else:
+                    cursor = connection.execute(
+                        "INSERT INTO articles (link, source, payload, first_seen_at, last_seen_at) VALUES (?, ?, ?, ?, ?)",
+                        (article["link"], source, json.dumps(article), now, now),
+                    )
+                    connection.execute(
+                        "INSERT INTO articles_fts (rowid, title, author, content) VALUES (?, ?, ?, ?)",
+                        (cursor.lastrowid, *_search_values(article)),
+                    )
+    finally:
+        connection.close()
+
+def load_articles(source=None, limit=None):
+    """Return the articles still considered current, newest first, for one source or all of them (at most `limit`)."""
+    since = time.time() - STORE_RESULT_TTL_SECONDS
+    query = "SELECT payload FROM articles WHERE last_seen_at >= ?"
+    params = [since]
+    if source:
+        query += " AND source = ?"
+        params.append(source)
+    query += " ORDER BY seq DESC"
+    if limit:
+        query += " LIMIT ?"
+        params.append(limit)
+
+    connection = connect()
+    try:
+        return [json.loads(payload) for (payload,) in connection.execute(query, params)]
+    finally:
+        connection.close()
+
+def load_articles_first_seen(start, end):
+    """Return the articles first stored between the `start` and `end` timestamps, oldest first."""
+    connection = connect()
+    try:
+        rows = connection.execute(
+            "SELECT payload FROM articles WHERE first_seen_at >= ? AND first_seen_at < ? ORDER BY seq",
+            (start, end),
+        )
+        return [json.loads(payload) for (payload,) in rows]
+    finally:
+        connection.close()
+
+def match_query(text):
+    """Turn free text into an FTS5 query that matches all of its words, ignoring FTS syntax characters."""
+    return " ".join(f'"{term}"' for term in re.findall(r"\w+", text))
+
+def search_articles(text, limit=20, offset=0, source=None):
+    """Return (total matches, results) for a full-text query, best bm25 rank first.
+
+    Each result is the stored article with its `score` (lower is better) and a content `snippet`.
+    """
+    query = match_query(text)
+    if not query:
+        return 0, []
+    where = "articles_fts MATCH ?"
+    params = [query]
+    if source:
+        where += " AND articles.source = ?"
+        params.append(source)
+
+    connection = connect()
+    try:
+        total = connection.execute(
+            f"SELECT COUNT(*) FROM articles_fts JOIN articles ON articles.seq = articles_fts.rowid WHERE {where}", params
+        ).fetchone()[0]
+        rows = connection.execute(
+            f"""
+            SELECT articles.payload, bm25(articles_fts, {', '.join(map(str, SEARCH_WEIGHTS))}) AS score,
+                   snippet(articles_fts, 2, '<b>', '</b>', '…', 24)
+            FROM articles_fts JOIN articles ON articles.seq = articles_fts.rowid
+            WHERE {where} ORDER BY score LIMIT ? OFFSET ?
+            """,
+            params + [limit, offset],
+        ).fetchall()
+    finally:
+        connection.close()
+
+    results = []
+    for payload, score, snippet in rows:
+        article = json.loads(payload)
+        article["score"] = round(score, 4)
+        article["snippet"] = snippet
+        results.append(article)
+    return total, results
+
+def latest_seq():
+    """Return the sequence number of the newest stored article (0 if the store is empty)."""
+    connection = connect()
+    try:
+        return connection.execute("SELECT COALESCE(MAX(seq), 0) FROM articles").fetchone()[0]
+    finally:
+        connection.close()
+
+def load_articles_after(seq, source=None, limit=100):
+    """Return (seq, article) pairs first stored after `seq`, oldest first, for one source or all of them."""
+    query = "SELECT seq, payload FROM articles WHERE seq > ?"
+    params = [seq]
+    if source:
+        query += " AND source = ?"
+        params.append(source)
+    query += " ORDER BY seq LIMIT ?"
+    params.append(limit)
+
+    connection = connect()
+    try:
+        return [(row_seq, json.loads(payload)) for row_seq, payload in connection.execute(query, params)]
+    finally:
+        connection.close()
@@ -0,0 +1,47 @@
+import asyncio
+import json
+import time
+from config.settings import STREAM_POLL_SECONDS, STREAM_HEARTBEAT_SECONDS, STREAM_BATCH_SIZE
+from utils.projection import project
+from utils.store import load_articles_after
+
+_waiters = set()  # Futures of subscribers in this process waiting for new articles
+
+def notify_new_articles():
+    """Wake the subscribers of this process; subscribers in other processes notice on their next poll."""
+    for waiter in list(_waiters):
+        if not waiter.done():
+            waiter.set_result(None)
+
+async def wait_for_new_articles(timeout):
+    """Return when notify_new_articles() is called or after `timeout` seconds."""
+    waiter = asyncio.get_running_loop().create_future()
+    _waiters.add(waiter)
+    try:
+        await asyncio.wait_for(waiter, timeout)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        _waiters.discard(waiter)
+
+def format_event(seq, article):
+    """Format one article as a Server-Sent Event whose id is its store sequence number."""
+    return f"id: {seq}\nevent: article\ndata: {json.dumps(article)}\n\n"
+
+async def article_events(request, cursor, source=None, fields=None):
+    """Yield every article stored after `cursor` as an SSE event, then keep following the store."""
+    yield f"retry: {int(STREAM_POLL_SECONDS * 1000)}\n\n"  # Reconnect delay for EventSource clients
+    last_write = time.monotonic()
+    while not await request.is_disconnected():
+        rows = await asyncio.to_thread(load_articles_after, cursor, source, STREAM_BATCH_SIZE)
+        for seq, article in rows:
+            cursor = seq
+            yield format_event(seq, project(article, fields))
+        if rows:
+            last_write = time.monotonic()
+            if len(rows) == STREAM_BATCH_SIZE:
+                continue  # More backlog to send
+        elif time.monotonic() - last_write >= STREAM_HEARTBEAT_SECONDS:
+            last_write = time.monotonic()
+            yield ": keep-alive\n\n"  # Comment line; stops proxies from closing an idle connection
+        await wait_for_new_articles(STREAM_POLL_SECONDS)
@@ -0,0 +1,73 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from config.loggers import logger
+from config.settings import TRACING, TRACE_PATH
+
+# Lightweight tracing: nested spans are tracked through a ContextVar (so they follow asyncio tasks)
+# and written as JSON lines to TRACE_PATH once their root span ends. View them with traces.py.
+
+_current = ContextVar("tracing_current_span", default=None)
+_pending = {}  # trace_id -> finished spans of traces whose root is still open
+_write_lock = threading.Lock()
+
+def _new_id():
+    return os.urandom(8).hex()
+
+@contextmanager
+def span(name, **attributes):
+    """Time the enclosed block as a span; a span without an open parent starts a new trace."""
+    if not TRACING:
+        yield None
+        return
+
+    parent = _current.get()
+    record = {
+        "trace_id": parent["trace_id"] if parent else _new_id(),
+        "span_id": _new_id(),
+        "parent_id": parent["span_id"] if parent else None,
+        "name": name,
+        "start": time.time(),
+        "attributes": attributes,
+    }
+    if parent is None:
+        _pending[record["trace_id"]] = []
+    token = _current.set(record)
+    started = time.perf_counter()
+    try:
+        yield record
+    except BaseException as e:
+        record["error"] = repr(e)
+        raise
+    finally:
+        record["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        _current.reset(token)
+        _finish(record)
+
+def _finish(record):
+    if record["parent_id"] is None:
+        _export(_pending.pop(record["trace_id"], []) + [record])
+    elif record["trace_id"] in _pending:
+        _pending[record["trace_id"]].append(record)
+    else:
+        _export([record])  # The root already ended (e.g. a task that outlived its request)
+
+def _export(records):
+    try:
+        with _write_lock, open(TRACE_PATH, "a") as trace_file:
+            trace_file.write("".join(json.dumps(record) + "\n" for record in records))
+    except OSError as e:
+        logger.error(f"Failed to write trace spans: {e}")
+
+def load_traces(path=TRACE_PATH):
+    """Read exported spans grouped by trace id, in file order."""
+    traces = {}
+    with open(path) as trace_file:
+        for line in trace_file:
+            if line.strip():
+                record = json.loads(line)
+                traces.setdefault(record["trace_id"], []).append(record)
+    return traces
@@ -1,7 +1,11 @@
 import aiohttp
 from bs4 import BeautifulSoup
 from datetime import datetime
+from urllib.parse import urlsplit
 from config.loggers import logger  # Import the logger
+from config.settings import UPSTREAM_BASE_URL
+from utils.tracing import span
+from utils.archive import archive_response
 import uuid
 
 headers = {
@@ -13,24 +17,37 @@ headers = {
     "Upgrade-Insecure-Requests": "1"
 }
 
+def upstream_url(url):
+    """Return the URL to request for a news-site URL, rerouted through UPSTREAM_BASE_URL when it is set."""
+    if not UPSTREAM_BASE_URL:
+        return url
+    parts = urlsplit(url)
+    return f"{UPSTREAM_BASE_URL}/{parts.netloc}{parts.path or '/'}" + (f"?{parts.query}" if parts.query else "")
+
 async def fetch_sitemap(session, sitemap_url):
     """Fetch the sitemap and return the BeautifulSoup object."""
-    async with session.get(sitemap_url) as response:
-        if response.status == 200:
-            logger.info("Successfully fetched the sitemap.")
-            return BeautifulSoup(await response.text(), 'lxml')
-        else:
-            logger.error(f"Error: Received status code {response.status} when trying to fetch the sitemap.")
-            return None
+    with span("fetch_sitemap", url=sitemap_url):
+        async with session.get(upstream_url(sitemap_url)) as response:
+            if response.status == 200:
+                logger.info("Successfully fetched the sitemap.")
+                text = await response.text()
+                await archive_response("sitemap", sitemap_url, text)
+                return BeautifulSoup(text, 'lxml')
+            else:
+                logger.error(f"Error: Received status code {response.status} when trying to fetch the sitemap.")
+                return None
 
 async def fetch_page_content(session, url):
     """Fetch the page content and return the BeautifulSoup object."""
-    async with session.get(url) as response:
-        if response.status == 200:
-            return BeautifulSoup(await response.text(), 'html.parser')
-        else:
-            logger.error(f"Failed to fetch page content for URL: {url}")
-            return None
+    with span("fetch_page_content", url=url):
+        async with session.get(upstream_url(url)) as response:
+            if response.status == 200:
+                text = await response.text()
+                await archive_response("page", url, text)
+                return BeautifulSoup(text, 'html.parser')
+            else:
+                logger.error(f"Failed to fetch page content for URL: {url}")
+                return None
 
 def create_article(title, link, author, content, source):
     """Create an article dictionary."""
@@ -67,3 +84,14 @@ def log_article_counts(total_articles, complete_count, incomplete_count):
     logger.info(f"incompleteArticles: {incomplete_count}")
     logger.info(f"currentDate: {current_date_str}")
     logger.info(f"currentTime: {current_time}")
+
+def log_incomplete_article(url, title, content, author):
+    """Log an article that is missing one of the required fields."""
+    missing_fields = []
+    if not title:
+        missing_fields.append("title")
+    if not content:
+        missing_fields.append("content")
+    if not author:
+        missing_fields.append("author")
+    logger.warning(f"Incomplete article at {url} missing fields: {', '.join(missing_fields)}")
\ No newline at end of file
@@ -0,0 +1,78 @@
+import argparse
+import asyncio
+import multiprocessing
+import aiohttp
+from config.loggers import logger
+from config.sources import SOURCES
+from routers.registry import get_spec
+from utils.job_queue import lease_jobs, complete_job, fail_job
+from utils.pipeline import process_candidate
+from utils.utils import headers
+
+# Crawl worker: leases per-URL fetch/extract jobs of its host shard from the job queue
+# and writes the resulting articles to the shared store.
+#
+#   python worker.py --shard 0 --shards 4     # one shard, e.g. one of several machines
+#   python worker.py --processes 4            # all shards as local processes
+
+async def process_job(sessions, job_id, candidate):
+    """Fetch and extract one queued candidate through its source's pipeline."""
+    if candidate.source not in SOURCES:
+        await asyncio.to_thread(fail_job, job_id, f"Unknown source {candidate.source}")
+        return
+
+    try:
+        spec = get_spec(candidate.source)
+        if candidate.source not in sessions:
+            sessions[candidate.source] = aiohttp.ClientSession(headers=spec.headers or headers)
+        # The sink stage stores the article; fetch errors and exceptions are raised so the job is retried
+        await process_candidate(spec, sessions[candidate.source], candidate, raise_errors=True)
+        await asyncio.to_thread(complete_job, job_id)  # Incomplete articles are logged by the source and not retried
+    except Exception as e:
+        logger.error(f"Job {job_id} for {candidate.url} failed: {e}")
+        await asyncio.to_thread(fail_job, job_id, e)
+
+async def run_worker(shard, shards, batch_size, poll_interval, once=False):
+    """Process jobs of one shard until cancelled (or until the shard is drained with `once`)."""
+    sessions = {}  # One session per source, reused across batches
+    logger.info(f"Crawl worker for shard {shard}/{shards} started")
+    try:
+        while True:
+            jobs = await asyncio.to_thread(lease_jobs, shard, shards, batch_size)
+            if not jobs:
+                if once:
+                    return
+                await asyncio.sleep(poll_interval)
+                continue
+            await asyncio.gather(*(process_job(sessions, job_id, candidate) for job_id, candidate in jobs))
+    finally:
+        for session in sessions.values():
+            await session.close()
+
+def run_shard(shard, shards, batch_size, poll_interval, once):
+    asyncio.run(run_worker(shard, shards, batch_size, poll_interval, once))
+
+def main():
+    parser = argparse.ArgumentParser(description="Run crawl workers fed by the local job queue.")
+    parser.add_argument("--shard", type=int, default=0, help="Shard handled by this process")
+    parser.add_argument("--shards", type=int, default=1, help="Total number of shards across all workers")
+    parser.add_argument("--processes", type=int, default=0, help="Start this many local processes, one per shard")
+    parser.add_argument("--batch-size", type=int, default=20, help="Jobs leased and processed concurrently per batch")
+    parser.add_argument("--poll-interval", type=float, default=5, help="Seconds to wait when the queue is empty")
+    parser.add_argument("--once", action="store_true", help="Exit when the shard has no runnable jobs left")
+    args = parser.parse_args()
+
+    if args.processes:
+        processes = [
+            multiprocessing.Process(target=run_shard, args=(shard, args.processes, args.batch_size, args.poll_interval, args.once))
+            for shard in range(args.processes)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+    else:
+        run_shard(args.shard, args.shards, args.batch_size, args.poll_interval, args.once)
+
+if __name__ == "__main__":
+    main()